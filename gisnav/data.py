@@ -24,6 +24,7 @@ import warnings
 warnings.filterwarnings(action='ignore', category=UserWarning, message='Gimbal lock detected.')
 
 from xml.etree import ElementTree
+from functools import cached_property, lru_cache
 from typing import Optional, Tuple
 from dataclasses import dataclass, field
 from collections import namedtuple
@@ -38,6 +39,61 @@ Dim = namedtuple('Dim', 'height width')
 TimePair = namedtuple('TimePair', 'local foreign')
 BBox = namedtuple('BBox', 'left bottom right top')
 
+_ESD_PRE_ROTATION = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]], dtype=np.float64)
+"""Constant left-hand factor of :meth:`.Attitude.to_esd_r` (nadir pitch adjustment combined with NED to ESD swap)"""
+
+_ESD_POST_ROTATION = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]], dtype=np.float64)
+"""Constant right-hand factor of :meth:`.Attitude.to_esd_r` (NED to ESD axis swap)"""
+
+
+def _quaternion_to_matrix(q: np.ndarray) -> np.ndarray:
+    """Returns rotation matrix for quaternion in SciPy (x, y, z, w) format
+
+    :param q: Quaternion in (x, y, z, w) format, does not need to be normalized
+    :return: 3x3 rotation matrix
+    """
+    x, y, z, w = np.asarray(q, dtype=np.float64) / math.sqrt(float(np.dot(q, q)))
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)]
+    ])
+
+
+@lru_cache(maxsize=4)
+def _cx_cy_fx(cx: float, cy: float, fx: float) -> np.ndarray:
+    """Returns read-only (cx, cy, fx) vector, cached by intrinsics values so it is only built once per camera
+
+    :param cx: Principal point x-coordinate
+    :param cy: Principal point y-coordinate
+    :param fx: Focal length
+    :return: Read-only (cx, cy, fx) vector
+    """
+    cx_cy_fx = np.array([cx, cy, fx])
+    cx_cy_fx.flags.writeable = False
+    return cx_cy_fx
+
+
+def _inv_3x3(m: np.ndarray) -> np.ndarray:
+    """Returns inverse of 3x3 matrix using the closed form (adjugate) solution
+
+    Much cheaper than :func:`numpy.linalg.inv` for a single small matrix.
+
+    :param m: Matrix to invert
+    :return: Inverse matrix
+    :raise: :class:`numpy.linalg.LinAlgError` if matrix is singular
+    """
+    (a, b, c), (d, e, f), (g, h, i) = m.tolist()
+    cof_a, cof_b, cof_c = e * i - f * h, f * g - d * i, d * h - e * g
+    det = a * cof_a + b * cof_b + c * cof_c
+    if det == 0 or not math.isfinite(det):
+        raise np.linalg.LinAlgError('Singular matrix')
+    return np.array([
+        [cof_a, c * h - b * i, b * f - c * e],
+        [cof_b, a * i - c * g, c * d - a * f],
+        [cof_c, b * g - a * h, a * e - b * d]
+    ]) / det
+
 
 # noinspection PyClassHasNoInit
 @dataclass(frozen=True)
@@ -79,7 +135,8 @@ class Attitude:
 
     def __post_init__(self):
         """Post-initialization validity checks"""
-        assert_len(self.q, 4)
+        if __debug__:
+            assert_len(self.q, 4)
         rotation = Rotation.from_quat(self.q)
         roll, pitch, yaw = tuple(rotation.as_euler('xyz' if self.extrinsic else 'XYZ'))
         object.__setattr__(self, 'roll', roll)
@@ -99,6 +156,16 @@ class Attitude:
         att = Attitude(q, self.extrinsic)
         return att
 
+    def to_esd_r(self) -> np.ndarray:
+        """Converts attitude from NED to solvePnP ESD world frame and returns it as a rotation matrix
+
+        Equivalent to ``self.to_esd().r`` but skips the intermediate quaternion conversions and the
+        :class:`scipy.spatial.transform.Rotation` overhead, making it suitable for per-frame use.
+
+        :return: Rotation matrix in ESD frame
+        """
+        return _ESD_PRE_ROTATION @ _quaternion_to_matrix(self.q).T @ _ESD_POST_ROTATION
+
     def as_rotation(self) -> Rotation:
         """Attitude aa :class:`scipy.spatial.transform.Rotation` instance"""
         return Rotation.from_quat(self.q)
@@ -126,6 +193,15 @@ class Img:
         """Set computed variables post-initialization"""
         object.__setattr__(self, 'dim', Dim(*self.arr.shape[0:2]))  # order is h, w, c
 
+    @cached_property
+    def gray(self) -> np.ndarray:
+        """Read-only grayscale version of the image, converted from BGR only once and only if needed"""
+        if self.arr.ndim == 2:
+            return self.arr
+        gray = cv2.cvtColor(self.arr, cv2.COLOR_BGR2GRAY)
+        gray.flags.writeable = False
+        return gray
+
 
 # noinspection PyClassHasNoInit
 @dataclass(frozen=True)
@@ -149,11 +225,27 @@ class CameraData:
 
     def __post_init__(self):
         """Set computed variables post-initialization"""
-        assert_shape(self.k, (3, 3))
-        object.__setattr__(self, 'fx', self.k[0][0])
-        object.__setattr__(self, 'fy', self.k[1][1])
-        object.__setattr__(self, 'cx', self.k[0][2])
-        object.__setattr__(self, 'cy', self.k[1][2])
+        if __debug__:
+            assert_shape(self.k, (3, 3))
+        # Store as Python floats (single index, no intermediate row views) so that the per-frame scalar arithmetic
+        # using these does not go through NumPy scalar types
+        object.__setattr__(self, 'fx', float(self.k[0, 0]))
+        object.__setattr__(self, 'fy', float(self.k[1, 1]))
+        object.__setattr__(self, 'cx', float(self.k[0, 2]))
+        object.__setattr__(self, 'cy', float(self.k[1, 2]))
+
+    @property
+    def cx_cy_fx(self) -> np.ndarray:
+        """Read-only (cx, cy, fx) vector used as reference for sanity checking estimated camera translations
+
+        Shared by all :class:`.CameraData` instances with the same intrinsics (see :func:`._cx_cy_fx`).
+        """
+        return _cx_cy_fx(self.cx, self.cy, self.fx)
+
+    @cached_property
+    def hfov(self) -> float:
+        """Horizontal field of view in radians"""
+        return 2 * math.atan(self.dim.width / (2 * self.fx))
 
 
 # noinspection PyClassHasNoInit
@@ -169,6 +261,37 @@ class MapData(_ImageHolder):
             assert self.elevation.arr.shape[0:2], self.image.arr.shape[0:2]
             assert_ndim(self.elevation.arr, 2)  # Grayscale image expected
 
+    @cached_property
+    def unrotated_to_wgs84(self) -> Tuple[np.ndarray, float]:
+        """Returns 2D perspective transformation from (unrotated and uncropped) map pixel coordinates to WGS84
+        coordinates along with vertical scaling factor
+
+        Does not depend on map rotation so it is computed only once per map and shared by all
+        :class:`.ContextualMapData` instances derived from this map.
+
+        :return: Tuple of 2D perspective transformation matrix and ratio of map boundary length in meters and pixels
+        """
+        src_corners = create_src_corners(*self.image.dim)
+        coords = np.array(box(*self.bbox).exterior.coords)
+        gt = GeoTrapezoid(coords)  # .reshape(-1, 1, 2)
+        dst_corners = gt.square_coords
+        dst_corners = np.flip(dst_corners, axis=1)  # from ENU frame to WGS 84 axis order
+        unrotated_to_wgs84 = cv2.getPerspectiveTransform(np.float32(src_corners).squeeze(),
+                                                         np.float32(dst_corners).squeeze())
+        unrotated_to_wgs84.flags.writeable = False
+
+        # Ratio of boundaries in pixels and meters -> Altitude (z) scaling factor
+        vertical_scaling = abs(gt.meter_length / (2 * self.image.dim.width + 2 * self.image.dim.height))
+
+        return unrotated_to_wgs84, vertical_scaling
+
+    @cached_property
+    def _rotated_rasters(self) -> dict:
+        """Rotated and cropped images computed by :class:`.ContextualMapData` from this map, keyed by
+        (rotation, crop, elevation) so that they (and their derived grayscale images) are not recomputed when map
+        rotation has not changed"""
+        return {}
+
 
 # noinspection PyClassHasNoInit
 @dataclass(frozen=True)
@@ -183,6 +306,9 @@ class ContextualMapData(_ImageHolder):
     mock_data: bool = False                     # Indicates that this was used for field of view guess (mock map data)
     altitude_scaling: Optional[float] = None    # altitude scaling (elevation raster meters -> camera pixels)
 
+    _MAX_CACHED_ROTATED_RASTERS = 8
+    """Maximum number of rotated and cropped rasters to keep per :class:`.MapData`"""
+
     # TODO: update docs - only one transformation is returned
     def _pix_to_wgs84(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """Returns tuple of affine 2D transformation matrix for converting matched pixel coordinates to WGS84
@@ -208,17 +334,7 @@ class ContextualMapData(_ImageHolder):
         rotation_padding = np.array([[0, 0, 1]])
         uncropped_to_unrotated = np.vstack((rotation, rotation_padding))
 
-        src_corners = create_src_corners(*self.map_data.image.dim)
-        coords = np.array(box(*self.map_data.bbox).exterior.coords)
-        gt = GeoTrapezoid(coords)  # .reshape(-1, 1, 2)
-        dst_corners = gt.square_coords
-        dst_corners = np.flip(dst_corners, axis=1)  # from ENU frame to WGS 84 axis order
-        unrotated_to_wgs84 = cv2.getPerspectiveTransform(np.float32(src_corners).squeeze(),
-                                                         np.float32(dst_corners).squeeze())
-
-        # Ratio of boundaries in pixels and meters -> Altitude (z) scaling factor
-        vertical_scaling = abs(gt.meter_length / \
-                               (2 * self.map_data.image.dim.width + 2 * self.map_data.image.dim.height))
+        unrotated_to_wgs84, vertical_scaling = self.map_data.unrotated_to_wgs84
 
         pix_to_wgs84_ = unrotated_to_wgs84 @ uncropped_to_unrotated @ pix_to_uncropped
 
@@ -233,11 +349,18 @@ class ContextualMapData(_ImageHolder):
         :return: Rotated and cropped map raster
         """
         image = self.map_data.image if not elevation else self.map_data.elevation
-        cx, cy = tuple(np.array(image.arr.shape[0:2]) / 2)
-        degrees = math.degrees(self.rotation)
-        r = cv2.getRotationMatrix2D((cx, cy), degrees, 1.0)
-        map_rotated = cv2.warpAffine(image.arr, r, image.arr.shape[1::-1])
-        map_cropped = self._crop_center(map_rotated, self.crop)
+        if self.rotation == 0:
+            # No need to warp the whole padded map raster, only the center part is used
+            map_cropped = self._crop_center(image.arr, self.crop)
+        else:
+            cx, cy = tuple(np.array(image.arr.shape[0:2]) / 2)
+            degrees = math.degrees(self.rotation)
+            r = cv2.getRotationMatrix2D((cx, cy), degrees, 1.0)
+            # Shift the rotation by the crop offset (same offset as in _crop_center) so that only the crop-sized
+            # center part of the padded map gets warped
+            r[0][2] -= math.floor(cx - self.crop.width / 2)
+            r[1][2] -= math.floor(cy - self.crop.height / 2)
+            map_cropped = cv2.warpAffine(image.arr, r, (self.crop.width, self.crop.height), flags=cv2.INTER_LINEAR)
         #if visualize:
             #cv2.imshow('padded', self.map_data.image.arr)
             #cv2.waitKey(1)
@@ -248,6 +371,25 @@ class ContextualMapData(_ImageHolder):
         assert map_cropped.shape[0:2] == self.crop, f'Cropped shape {map_cropped.shape} did not match dims {self.crop}.'
         return map_cropped
 
+    def _rotated_and_cropped_img(self, elevation: bool = False) -> Img:
+        """Returns rotated and cropped map from :meth:`._rotate_and_crop_map`, reusing a previously computed one
+        from :py:attr:`.MapData._rotated_rasters` if available
+
+        :param elevation: Set True to do rotation on elevation raster instead
+        :return: Rotated and cropped map image
+        """
+        rotated_rasters = self.map_data._rotated_rasters
+        key = self.rotation, self.crop, elevation
+        img = rotated_rasters.get(key, None)
+        if img is None:
+            map_cropped = self._rotate_and_crop_map(elevation)
+            map_cropped.flags.writeable = False  # Shared between ContextualMapData instances so must not be modified
+            img = Img(map_cropped)
+            if len(rotated_rasters) >= self._MAX_CACHED_ROTATED_RASTERS:
+                del rotated_rasters[next(iter(rotated_rasters))]  # Evict oldest
+            rotated_rasters[key] = img
+        return img
+
 
     @staticmethod
     def _crop_center(img: np.ndarray, dimensions: Dim) -> np.ndarray:
@@ -266,9 +408,9 @@ class ContextualMapData(_ImageHolder):
 
     def __post_init__(self):
         """Set computed fields after initialization."""
-        object.__setattr__(self, 'image', Img(self._rotate_and_crop_map()))
+        object.__setattr__(self, 'image', self._rotated_and_cropped_img())
         if self.map_data.elevation is not None:
-            object.__setattr__(self, 'elevation', Img(self._rotate_and_crop_map(True)))
+            object.__setattr__(self, 'elevation', self._rotated_and_cropped_img(True))
         else:
             object.__setattr__(self, 'elevation', None)
         object.__setattr__(self, 'pix_to_wgs84', self._pix_to_wgs84())
@@ -295,13 +437,16 @@ class Pose:
 
         :raise: :class:`.DataValueError` if r or t is invalid
         """
-        # Data class is frozen so need to use object.__setattr__ to assign values
-        object.__setattr__(self, 'e', np.hstack((self.r, self.t)))
+        # Validity checks first so that invalid poses are rejected before computing derived fields
+        # Shapes are checked before NaNs because they are cheaper to check
+        if self.r.shape != (3, 3) or self.t.shape != (3, 1) or np.isnan(self.r).any() or np.isnan(self.t).any():
+            raise DataValueError(f'Pose input arguments were invalid: {self.r}, {self.t}.')
 
-        # Validity checks
-        if np.isnan(self.r).any() or np.isnan(self.t).any() \
-            or self.r.shape != (3, 3) or self.t.shape != (3, 1):
-            raise DataValueError(f'Pose input arguments were invalid: {r}, {t}.')
+        # Data class is frozen so need to use object.__setattr__ to assign values
+        e = np.empty((3, 4), dtype=np.result_type(self.r, self.t))
+        e[:, :3] = self.r
+        e[:, 3:] = self.t
+        object.__setattr__(self, 'e', e)
 
     def __iter__(self):
         """Convenience interface for converting e.g. to tuple"""
@@ -402,7 +547,9 @@ class FixedCamera:
 
         :return: Field of view and principal point in pixel and WGS84 coordinates, or None if could not estimate
         """
-        assert_type(self.image_pair.ref, ContextualMapData)  # Need pix_to_wgs84, FixedCamera should have map data match
+        if __debug__:
+            # Need pix_to_wgs84, FixedCamera should have map data match
+            assert_type(self.image_pair.ref, ContextualMapData)
         pix_to_wgs84_2d = self.image_pair.ref.pix_to_wgs84
         pix_to_wgs84_2d[2][2] = 1
         h_wgs84 = pix_to_wgs84_2d @ self.inv_h
@@ -453,23 +600,26 @@ class FixedCamera:
         :param h_mat: Homography matrix
         :return: Tuple of FOV corner coordinates and principal point np.ndarrays
         """
-        assert_type(img_arr_shape, tuple)
-        assert_len(img_arr_shape, 2)
-        assert_type(h_mat, np.ndarray)
+        if __debug__:
+            assert_type(img_arr_shape, tuple)
+            assert_len(img_arr_shape, 2)
+            assert_type(h_mat, np.ndarray)
         h, w = img_arr_shape  # height before width in np.array shape
         src_fov = create_src_corners(h, w)
 
         principal_point_src = np.array([[[w / 2, h / 2]]])
         src_fov_and_c = np.vstack((src_fov, principal_point_src))
 
-        assert_shape(h_mat, (3, 3))
-        assert_ndim(src_fov, 3)
+        if __debug__:
+            assert_shape(h_mat, (3, 3))
+            assert_ndim(src_fov, 3)
         dst_fov_and_c = cv2.perspectiveTransform(src_fov_and_c, h_mat)
 
         dst_fov, principal_point_dst = np.vsplit(dst_fov_and_c, [-1])
 
-        assert_shape(dst_fov, src_fov.shape)
-        assert_shape(principal_point_dst, principal_point_src.shape)
+        if __debug__:
+            assert_shape(dst_fov, src_fov.shape)
+            assert_shape(principal_point_dst, principal_point_src.shape)
 
         return dst_fov, principal_point_dst
 
@@ -485,12 +635,13 @@ class FixedCamera:
         """
         assert self.fov is not None  # Call _estimate_fov before _estimate_position!
         # Translation in WGS84 (and altitude or z-axis translation in meters above ground)
-        assert_type(self.image_pair.ref, ContextualMapData)  # need pix_to_wgs84
+        if __debug__:
+            assert_type(self.image_pair.ref, ContextualMapData)  # need pix_to_wgs84
         t_wgs84 = self.image_pair.ref.pix_to_wgs84 @ np.append(self.camera_position[0:2], 1)
         t_wgs84[2] = -self.fov.scaling * self.camera_position[2]  # In NED frame z-coordinate is negative above ground, make altitude >0
 
         # Check that we have all the values needed for a global position
-        if not all([(isinstance(x, float) or np.isnan(x)) for x in t_wgs84.squeeze()]):
+        if not np.isfinite(t_wgs84).all():
             # Not a valid position estimate
             return None
 
@@ -525,9 +676,10 @@ class FixedCamera:
             self.terrain_altitude_amsl is not None and self.terrain_altitude_ellipsoid is None:
                 raise DataValueError('Please provide terrain altitude in both AMSL and above WGS 84 ellipsoid.')
 
-        object.__setattr__(self, 'h', img.camera_data.k @ np.delete(self.pose.e, 2, 1))  # Remove z-column, making the matrix square
+        # Drop z-column to make the matrix square (indexing is much cheaper than np.delete)
+        object.__setattr__(self, 'h', img.camera_data.k @ self.pose.e[:, (0, 1, 3)])
         try:
-            object.__setattr__(self, 'inv_h', np.linalg.inv(self.h))
+            object.__setattr__(self, 'inv_h', _inv_3x3(self.h))
         except np.linalg.LinAlgError as _:
             raise DataValueError('H was not invertible')
         object.__setattr__(self, 'camera_position', -self.pose.r.T @ self.pose.t)
@@ -549,11 +701,10 @@ class FixedCamera:
             # This comes from Position.__post_init__
             raise
 
-        camera_data = img.camera_data
-        reference = np.array([camera_data.cx, camera_data.cy, camera_data.fx])
+        reference = img.camera_data.cx_cy_fx  # Built once per camera (cached by intrinsics)
+        abs_t = np.abs(self.pose.t).squeeze()
         # TODO: The 3 and 6 are an arbitrary thresholds, make configurable?
-        if (np.abs(self.pose.t).squeeze() >= 3 * reference).any() or \
-                (np.abs(self.pose.t).squeeze() >= 6 * reference).any():
+        if (abs_t >= 3 * reference).any() or (abs_t >= 6 * reference).any():
             raise DataValueError(f'pose.t {self.pose.t} & pose.t {self.pose.t} have values too large compared to ' \
                                  f'(cx, cy, fx): {reference}.')
 
@@ -575,9 +726,12 @@ class PackageData:
     license_name: str
 
     @staticmethod
+    @lru_cache(maxsize=4)
     def parse_package_data(package_file: str) -> PackageData:
         """Parses package.xml in current folder
 
+        Parsed data is cached per file, use :meth:`parse_package_data.cache_clear` to force re-reading the file.
+
         :param package_file: Absolute path to package.xml file
         :return: Parsed package data
         :raise FileNotFoundError: If package.xml file is not found
@@ -612,8 +766,9 @@ def create_src_corners(h: int, w: int) -> np.ndarray:
     :param w: Source image width
     :return: Source image corner pixel coordinates
     """
-    assert_type(h, int)
-    assert_type(w, int)
+    if __debug__:
+        assert_type(h, int)
+        assert_type(w, int)
     assert h > 0 and w > 0, f'Height {h} and width {w} are both expected to be positive.'
     return np.float32([[0, 0], [0, h - 1], [w - 1, h - 1], [w - 1, 0]]).reshape(-1, 1, 2)
 
@@ -1,7 +1,6 @@
 """Module containing classes that wrap :class:`geopandas.GeoSeries` for convenience"""
 from __future__ import annotations
 from typing import TYPE_CHECKING, Tuple
-import math
 import numpy as np
 import warnings
 warnings.filterwarnings(action='ignore', category=UserWarning, message='Geometry is in a geographic CRS.')
@@ -63,7 +62,8 @@ class _GeoObject(ABC):
     def __post_init__(self):
         """Post-initialization validity checks"""
         # TODO enforce, do not assert
-        assert_len(self._geoseries, 1)
+        if __debug__:
+            assert_len(self._geoseries, 1)
         assert self._geoseries.crs is not None
 
 
@@ -104,9 +104,11 @@ class _GeoPolygon(_GeoObject):
         .. note::
             Shapely duplicates the Polygon starting point to close its boundary but this property removes the duplicate
         """
-        assert_len(self._geoseries[0].exterior.coords, 5)
+        if __debug__:
+            assert_len(self._geoseries[0].exterior.coords, 5)
         exterior_coords = np.array(self._geoseries[0].exterior.coords)[:-1]
-        assert_len(exterior_coords, 4)
+        if __debug__:
+            assert_len(exterior_coords, 4)
         return exterior_coords
 
     def intersection(self, box_: _GeoPolygon) -> GeoTrapezoid:
@@ -118,7 +120,8 @@ class _GeoPolygon(_GeoObject):
 
         :raise: ValueError if wrapped polygon is not valid
         """
-        assert_type(self._geoseries[0], Polygon)
+        if __debug__:
+            assert_type(self._geoseries[0], Polygon)
 
 
 class GeoPt(_GeoObject):
@@ -175,7 +178,8 @@ class GeoSquare(_GeoPolygon):
         """
         self._geoseries = center.to_crs('epsg:3857')._geoseries.buffer(radius / center.spherical_adjustment)\
             .to_crs(crs).envelope
-        assert_type(self._geoseries[0], Polygon)
+        if __debug__:
+            assert_type(self._geoseries[0], Polygon)
 
     @property
     def coords(self) -> np.ndarray:
@@ -247,8 +251,7 @@ def get_dynamic_map_radius(camera_data: CameraData, max_map_radius: int, altitud
     :param altitude: Altitude of camera in meters
     :return: Suitable map radius in meters
     """
-    hfov = 2 * math.atan(camera_data.dim.width / (2 * camera_data.fx))
-    map_radius = 1.5 * hfov * altitude  # Arbitrary padding of 50%
+    map_radius = 1.5 * camera_data.hfov * altitude  # Arbitrary padding of 50%
     return min(map_radius, max_map_radius)
 
 
@@ -43,54 +43,29 @@ class AutopilotNode(BaseNode, ABC):
                                                          QoSPresetProfiles.SENSOR_DATA.value)
 
         # Subscribers
-        # terrain_altitude and egm96_height properties intended to be used by extending classes -> no name mangling
+        # terrain_altitude and egm96_height attributes intended to be used by extending classes -> no name mangling
+        # Terrain altitude, needed by implementing classes to generate vehicle GeoPoseStamped message
         self.terrain_altitude = None
         self.__terrain_altitude_sub = self.create_subscription(Altitude,
                                                                messaging.ROS_TOPIC_TERRAIN_ALTITUDE,
                                                                self.__terrain_altitude_callback,
                                                                QoSPresetProfiles.SENSOR_DATA.value)
 
+        # EGM96 geoid height, needed by implementing classes to generate vehicle GeoPoseStamped and Altitude messages
         self.egm96_height = None
         self.__egm96_height_sub = self.create_subscription(Float32,
                                                            messaging.ROS_TOPIC_EGM96_HEIGHT,
                                                            self.__egm96_height_callback,
                                                            QoSPresetProfiles.SENSOR_DATA.value)
 
-    # region public properties
-    @property
-    def terrain_altitude(self) -> Optional[Altitude]:
-        """Terrain altitude
-
-        Needed by implementing classes to generate vehicle :class:`geographic_msgs.msg.GeoPoseStamped` message
-        """
-        return self.__terrain_altitude
-
-    @terrain_altitude.setter
-    def terrain_altitude(self, value: Optional[Altitude]) -> None:
-        self.__terrain_altitude = value
-
-    @property
-    def egm96_height(self) -> Optional[Float32]:
-        """EGM96 geoid height
-
-        Needed by implementing classes to generate vehicle :class:`geographic_msgs.msg.GeoPoseStamped` and
-        :class:`mavros_msgs.msg.Altitude` messages
-        """
-        return self.__egm96_height
-
-    @egm96_height.setter
-    def egm96_height(self, value: Optional[Float32]) -> None:
-        self.__egm96_height = value
-    # endregion public properties
-
     # region ROS subscriber callbacks
     def __terrain_altitude_callback(self, msg: Altitude) -> None:
         """Handles terrain altitude message"""
-        self.__terrain_altitude = msg
+        self.terrain_altitude = msg
 
     def __egm96_height_callback(self, msg: Float32) -> None:
         """Handles ellipsoid height message"""
-        self.__egm96_height = msg
+        self.egm96_height = msg
     # endregion ROS subscriber callbacks
 
     # region publish hooks
@@ -4,8 +4,9 @@ from typing import Union, List, Tuple
 import time
 
 from rclpy.node import Node
+from rclpy.parameter import Parameter
 from rclpy.exceptions import ParameterAlreadyDeclaredException
-from rcl_interfaces.msg import ParameterDescriptor
+from rcl_interfaces.msg import ParameterDescriptor, SetParametersResult
 
 
 class BaseNode(ABC, Node):
@@ -37,6 +38,8 @@ class BaseNode(ABC, Node):
         """
         super().__init__(name, allow_undeclared_parameters=True, automatically_declare_parameters_from_overrides=True)
         self.__declare_ros_params()
+        self.__cache_ros_params()
+        self.add_on_set_parameters_callback(self.__on_set_parameters)
 
     @property
     def sec(self) -> int:
@@ -64,3 +67,34 @@ class BaseNode(ABC, Node):
                 # This means parameter is already declared (e.g. from a YAML file)
                 value = self.get_parameter(param).value
                 self.get_logger().info(f'ROS parameter "{param}" already declared with value "{value}".')
+
+    @staticmethod
+    def __cached_param_attr(param: str) -> str:
+        """Returns name of the attribute that caches the value of given ROS parameter
+
+        :param param: ROS parameter name
+        :return: Attribute name, e.g. ``_p_max_pitch`` for ROS parameter ``max_pitch``
+        """
+        return '_p_' + param.replace('.', '_')
+
+    def __cache_ros_params(self) -> None:
+        """Caches values of ROS parameters declared in :py:attr:`.ROS_PARAM_DEFAULTS` into ``_p_<name>`` attributes
+
+        Reading a ROS parameter via :meth:`rclpy.node.Node.get_parameter` is relatively expensive because of the
+        :class:`rcl_interfaces.msg.ParameterValue` marshalling involved. Callbacks that run at high frequency should
+        read the cached attributes instead.
+        """
+        for param, _, _ in self.ROS_PARAM_DEFAULTS:
+            setattr(self, self.__cached_param_attr(param), self.get_parameter(param).value)
+
+    def __on_set_parameters(self, params: List[Parameter]) -> SetParametersResult:
+        """Refreshes cached ROS parameter values when mutable ROS parameters are set at runtime
+
+        :param params: ROS parameters that are being set
+        :return: Successful result (changes are never rejected)
+        """
+        mutable_params = [param for param, _, read_only in self.ROS_PARAM_DEFAULTS if not read_only]
+        for param in params:
+            if param.name in mutable_params:
+                setattr(self, self.__cached_param_attr(param.name), param.value)
+        return SetParametersResult(successful=True)
@@ -1,5 +1,7 @@
 """Abstract base class for :class:`sensor_msgs.msg.CameraInfo and :class:`sensor_msgs.msg.Image` subscribers"""
+import traceback
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
 import numpy as np
@@ -8,6 +10,7 @@ from sensor_msgs.msg import CameraInfo, Image
 
 from .base_node import BaseNode
 from gisnav.data import Dim, CameraData
+from gisnav.geo import GeoPt, GeoTrapezoid
 from gisnav.assertions import assert_type
 
 
@@ -37,12 +40,17 @@ class CameraSubscriberNode(BaseNode):
         """
         super().__init__(name)
 
-        self.__camera_info = None
+        self.__camera_data = None  # Built from latest CameraInfo message
+        self.__map_size_with_padding = None, None  # (img_dim, map_size_with_padding) cache
         self.__camera_info_sub = self.create_subscription(CameraInfo,
                                                           self.ROS_CAMERA_INFO_TOPIC,
                                                           self.__camera_info_callback,
                                                           QoSPresetProfiles.SENSOR_DATA.value)
 
+        # Debug GeoJSON exports are written in a background thread so that file I/O does not block callbacks
+        self.__export_executor = ThreadPoolExecutor(max_workers=1)
+        self.__export_future = None
+
         self.__image_sub = self.create_subscription(Image,
                                                     self.ROS_IMAGE_TOPIC,
                                                     self.image_callback,
@@ -51,12 +59,15 @@ class CameraSubscriberNode(BaseNode):
     def __camera_info_callback(self, msg: CameraInfo) -> None:
         """Handles latest :class:`sensor_msgs.msg.CameraInfo` message
 
-        Not intended to be implemented by extending classes. Camera info is stored and provided to extending class
-        through :py:attr:`.camera_data` property.
+        Not intended to be implemented by extending classes. Camera data is built once per message here and provided
+        to extending class through :py:attr:`.camera_data` property.
 
         :param msg: Latest :class:`sensor_msgs.msg.CameraInfo` message
         """
-        self.__camera_info = msg
+        if not all(hasattr(msg, attr) for attr in ['k', 'height', 'width']):
+            return None
+        # Assign fully built object in a single step so that readers in other threads never see a partial update
+        self.__camera_data = CameraData(msg.k.reshape((3, 3)), dim=Dim(msg.height, msg.width))
 
     @abstractmethod
     def image_callback(self, msg: Image) -> None:
@@ -69,8 +80,9 @@ class CameraSubscriberNode(BaseNode):
     @property
     def img_dim(self) -> Optional[Dim]:
         """Image resolution from latest :class:`px4_msgs.msg.CameraInfo` message, None if not available"""
-        if self.camera_data is not None:
-            return self.camera_data.dim
+        camera_data = self.camera_data
+        if camera_data is not None:
+            return camera_data.dim
         else:
             self.get_logger().warn('Camera data was not available, returning None as declared image size.')
             return None
@@ -87,18 +99,71 @@ class CameraSubscriberNode(BaseNode):
         the map rasters after arbitrary 2D rotation. The height and width will both be equal to the diagonal of the
         declared (:py:attr:`.img_dim`) camera frame dimensions.
         """
-        if self.img_dim is None:
+        img_dim = self.img_dim
+        if img_dim is None:
             self.get_logger().warn(f'Dimensions not available - returning None as map size.')
             return None
-        diagonal = int(np.ceil(np.sqrt(self.img_dim.width ** 2 + self.img_dim.height ** 2)))
+
+        # Only recompute when camera frame dimensions change
+        cached_img_dim, cached_map_size = self.__map_size_with_padding
+        if img_dim == cached_img_dim:
+            return cached_map_size
+
+        diagonal = int(np.ceil(np.sqrt(img_dim.width ** 2 + img_dim.height ** 2)))
         assert_type(diagonal, int)
+        self.__map_size_with_padding = img_dim, (diagonal, diagonal)
         return diagonal, diagonal
 
     @property
     def camera_data(self) -> Optional[CameraData]:
-        """Camera intrinsics or None if not available"""
-        if not all(hasattr(self.__camera_info, attr) for attr in ['k', 'height', 'width']):
+        """Camera intrinsics or None if not available
+
+        Built once per received :class:`sensor_msgs.msg.CameraInfo` message. May be replaced by a newer instance
+        between accesses, so callers should read it once and reuse the returned value.
+        """
+        return self.__camera_data
+
+    def destroy_node(self) -> None:
+        """Shuts down GeoJSON export worker thread when node is destroyed"""
+        # Python 3.8 compatible equivalent of shutdown(wait=False, cancel_futures=True)
+        if self.__export_future is not None:
+            self.__export_future.cancel()
+        self.__export_executor.shutdown(wait=False)
+        super().destroy_node()
+
+    def _export_position(self, position: GeoPt, fov: GeoTrapezoid, filename: str) -> None:
+        """Exports the computed position and field of view into a GeoJSON file
+
+        The file is written in a background thread. If the previous export is still being written, the new one is
+        dropped.
+
+        .. note::
+            The GeoJSON file is not used by the node but can be accessed by GIS software to visualize the data it
+            contains
+
+        :param position: Computed camera position or projected principal point for gimbal projection
+        :param: fov: Field of view of camera projected to ground
+        :param filename: Name of file to write into
+        """
+        if __debug__:
+            assert_type(position, GeoPt)
+            assert_type(fov, GeoTrapezoid)
+            assert_type(filename, str)
+        if self.__export_future is not None and not self.__export_future.done():
             return None
-        else:
-            camera_info = self.__camera_info
-            return CameraData(camera_info.k.reshape((3, 3)), dim=Dim(camera_info.height, camera_info.width))
+
+        # Appending creates a new GeoSeries so the worker does not share state with the caller
+        geoseries = position._geoseries.append(fov._geoseries)
+        self.__export_future = self.__export_executor.submit(self.__write_geojson, geoseries, filename)
+
+    def __write_geojson(self, geoseries, filename: str) -> None:
+        """Writes GeoSeries to file, intended to be run in :meth:`._export_position` background thread
+
+        :param geoseries: GeoSeries to write
+        :param filename: Name of file to write into
+        """
+        try:
+            geoseries.to_file(filename)
+        except Exception as e:
+            self.get_logger().error(f'Could not write file {filename} because of exception:'
+                                    f'\n{e}\n{traceback.format_exc()}')
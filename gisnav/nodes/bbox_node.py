@@ -1,5 +1,6 @@
 """A node that publishes bounding box of field of view projected to ground from vehicle approximate location"""
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import numpy as np
 from rclpy.qos import QoSPresetProfiles
@@ -111,7 +112,7 @@ class BBoxNode(CameraSubscriberNode):
         .. note::
             If you know your camera will be nadir-facing, disabling ``gimbal_projection`` may improve performance
         """
-        gimbal_projection_flag = self.get_parameter('gimbal_projection').get_parameter_value().bool_value
+        gimbal_projection_flag = self._p_gimbal_projection
         if type(gimbal_projection_flag) is bool:
             return gimbal_projection_flag
         else:
@@ -190,7 +191,7 @@ class BBoxNode(CameraSubscriberNode):
             self.get_logger().warn('Missing required camera data or img dim for generating mock image data.')
             return None
 
-        image_data = ImageData(image=Img(np.zeros(self.img_dim)),
+        image_data = ImageData(image=Img(self._mock_raster(self.img_dim)),
                                frame_id='mock_image_data',
                                timestamp=self.usec,
                                camera_data=self.camera_data)
@@ -225,8 +226,23 @@ class BBoxNode(CameraSubscriberNode):
         radius = scaling * altitude_agl
 
         bbox = GeoSquare(xy, radius)
-        map_data = MapData(bbox=BBox(*bbox.bounds), image=Img(np.zeros(self.map_size_with_padding)))
+        map_data = MapData(bbox=BBox(*bbox.bounds), image=Img(self._mock_raster(self.map_size_with_padding)))
         return map_data
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _mock_raster(shape: Tuple[int, int]) -> np.ndarray:
+        """Returns read-only zero raster of given shape for mock image and map data
+
+        Only the raster dimensions are used when projecting the mock field of view so the same raster is reused instead
+        of allocating a new (padded map sized) raster on every bounding box update.
+
+        :param shape: Raster shape (height, width)
+        :return: Read-only zero raster
+        """
+        raster = np.zeros(shape, dtype=np.uint8)
+        raster.flags.writeable = False
+        return raster
     # endregion
 
     def _guess_fov_center(self, xy: GeoPt) -> Optional[GeoPt]:
@@ -240,9 +256,9 @@ class BBoxNode(CameraSubscriberNode):
             return None
         else:
             gimbal_attitude = Attitude(q=messaging.as_np_quaternion(self._gimbal_quaternion))
-            gimbal_attitude = gimbal_attitude.to_esd()  # Need coordinates in image frame, not NED
+            r = gimbal_attitude.to_esd_r()  # Need coordinates in image frame, not NED
 
-        assert gimbal_attitude is not None
+        assert r is not None
 
         if self.camera_data is None:
             self.get_logger().warn('Camera data not available, cannot create a mock pose to generate a FOV guess.')
@@ -260,11 +276,13 @@ class BBoxNode(CameraSubscriberNode):
             self.get_logger().warn('Home geopoint not available, cannot create a mock pose to generate a FOV guess.')
             return None
 
-        translation = -gimbal_attitude.r @ np.array([self.camera_data.cx, self.camera_data.cy, -self.camera_data.fx])
+        camera_data = self.camera_data
+        # Same as -r @ [cx, cy, -fx] but negates the vector instead of the matrix, and yields a column vector directly
+        translation = r @ np.array([[-camera_data.cx], [-camera_data.cy], [camera_data.fx]])
         try:
-            pose = Pose(gimbal_attitude.r, translation.reshape((3, 1)))
+            pose = Pose(r, translation)
         except DataValueError as e:
-            self.get_logger().warn(f'Pose input values: {gimbal_attitude.r}, {translation} were invalid: {e}.')
+            self.get_logger().warn(f'Pose input values: {r}, {translation} were invalid: {e}.')
             return None
 
         try:
@@ -282,7 +300,7 @@ class BBoxNode(CameraSubscriberNode):
             return None
 
         if __debug__:
-            export_projection = self.get_parameter('export_projection').get_parameter_value().string_value
+            export_projection = self._p_export_projection
             if export_projection != '':
                 self._export_position(mock_fixed_camera.fov.c, mock_fixed_camera.fov.fov, export_projection)
 
@@ -321,7 +339,7 @@ class BBoxNode(CameraSubscriberNode):
         if map_update_altitude_agl <= 0:
             self.get_logger().warn(f'Map update altitude {map_update_altitude_agl} should be > 0, skipping map update.')
             return None
-        max_map_radius = self.get_parameter('max_map_radius').get_parameter_value().integer_value
+        max_map_radius = self._p_max_map_radius
         map_radius = get_dynamic_map_radius(self.camera_data, max_map_radius, map_update_altitude_agl)
         map_candidate = GeoSquare(projected_center if projected_center is not None else geopt, map_radius)
 
@@ -1,13 +1,14 @@
 """Contains :class:`.Node` that provides :class:`OrthoImage3D` s"""
 import time
-from typing import Optional, Tuple, get_args
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
+from typing import Optional, Tuple, List
 
 import numpy as np
 import cv2
 import requests
 from owslib.wms import WebMapService
 from owslib.util import ServiceException
-from shapely.geometry import box
 from pygeodesy.geoids import GeoidPGM
 from rclpy.timer import Timer
 from rclpy.qos import QoSPresetProfiles
@@ -126,6 +127,15 @@ class MapNode(CameraSubscriberNode):
     _WMS_CONNECTION_ATTEMPT_DELAY = 10
     """Delay in seconds until a new WMS connection is attempted in case of connection error"""
 
+    _WMS_MAX_WORKERS = 4
+    """Number of worker threads for WMS GetMap requests
+
+    .. note::
+        At least four workers are needed: :meth:`._get_map` is run in one worker and it sends the DEM request to
+        another worker so that the orthoimage and DEM requests overlap, and the home DEM request may run concurrently
+        with a bounding box request.
+    """
+
     ROS_PARAM_DEFAULTS = [
         ('url', ROS_D_URL, True),
         ('version', ROS_D_VERSION, True),
@@ -182,19 +192,25 @@ class MapNode(CameraSubscriberNode):
                                                            QoSPresetProfiles.SENSOR_DATA.value)
 
         publish_rate = self.get_parameter('publish_rate').get_parameter_value().integer_value
-        self._publish_timer = self._create_publish_timer(publish_rate)
-        self._ortho_image_3d_msg = None
+        self._publish_timer = self._create_publish_timer(publish_rate)  # OrthoImage3D publish and map update timer
 
         # For map update timer / DEM requests
-        self._origin_dem_altitude = None
+        self._origin_dem_altitude = None  # Elevation layer (DEM) altitude at local frame origin
         self._home_dem = None  # dem map data
         self._map_data = None
+        # (bbox, map data, threshold, decision) of the latest _should_request_new_map call
+        self._new_map_decision = None
 
         # TODO: make configurable / use shared folder home path instead
         self._egm96 = GeoidPGM('/usr/share/GeographicLib/geoids/egm96-5.pgm', kind=-3)
 
         self._cv_bridge = CvBridge()
 
+        # GetMap requests are network I/O bound so they are run in a worker thread to not block the executor
+        self._wms_executor = ThreadPoolExecutor(max_workers=self._WMS_MAX_WORKERS)
+        self._wms_future = None
+        self._home_dem_future = None
+
         url = self.get_parameter('url').get_parameter_value().string_value
         version = self.get_parameter('version').get_parameter_value().string_value
         timeout = self.get_parameter('timeout').get_parameter_value().integer_value
@@ -212,34 +228,9 @@ class MapNode(CameraSubscriberNode):
 
     # region Properties
     @property
-    def _publish_timer(self) -> Timer:
-        """:class:`gisnav_msgs.msg.OrthoImage3D` publish and map update timer"""
-        return self.__publish_timer
-
-    @_publish_timer.setter
-    def _publish_timer(self, value: Timer) -> None:
-        assert_type(value, Timer)
-        self.__publish_timer = value
-
-    @property
-    def _ortho_image_3d_msg(self) -> Optional[OrthoImage3D]:
-        """:class:`gisnav_msgs.msg.OrthoImage3D` message to publish"""
-        return self.__ortho_image_3d_msg
-
-    @_ortho_image_3d_msg.setter
-    def _ortho_image_3d_msg(self, value: Optional[OrthoImage3D]) -> None:
-        assert_type(value, get_args(Optional[OrthoImage3D]))
-        self.__ortho_image_3d_msg = value
-
-    @property
-    def _origin_dem_altitude(self) -> Optional[float]:
-        """Elevation layer (DEM) altitude at local frame origin"""
-        return self.__origin_dem_altitude
-
-    @_origin_dem_altitude.setter
-    def _origin_dem_altitude(self, value: Optional[float]) -> None:
-        assert_type(value, get_args(Optional[float]))
-        self.__origin_dem_altitude = value
+    def _wms_results_pending(self) -> bool:
+        """True if there is a pending GetMap request"""
+        return self._wms_future is not None and not self._wms_future.done()
 
     # region rclpy subscriber callbacks
     def _vehicle_geopose_callback(self, msg: GeoPoseStamped) -> None:
@@ -259,15 +250,55 @@ class MapNode(CameraSubscriberNode):
         """Stores :class:`geograhpic_msgs.msg.BoundingBox` message"""
         self._bounding_box = msg
 
+        if self._wms_results_pending:
+            # Previous GetMap request not yet complete, do not queue up more requests
+            return
+
         bbox = BBox(msg.min_pt.longitude, msg.min_pt.latitude, msg.max_pt.longitude, msg.max_pt.latitude)
         if self._should_request_new_map(bbox):
-            if self.map_size_with_padding is not None:
-                img, dem = self._get_map(bbox, self.map_size_with_padding)
-                self._map_data = MapData(bbox=bbox, image=Img(img), elevation=Img(dem))
-                self._ortho_image_3d_msg = self._create_msg(bbox, img, dem)
+            map_size = self.map_size_with_padding
+            if map_size is not None:
+                self._wms_future = self._wms_executor.submit(self._get_map_data_and_msg, bbox, map_size)
+                self._wms_future.add_done_callback(self._get_map_done_callback)
             else:
                 self.get_logger().warn(f'Cannot request new map, could not determine size '
-                                       f'({self.map_size_with_padding}) parameter for GetMap request.')
+                                       f'({map_size}) parameter for GetMap request.')
+
+    def _get_map_data_and_msg(self, bbox: BBox, size: Tuple[int, int]) -> Optional[Tuple[MapData, OrthoImage3D]]:
+        """Sends GetMap request and returns the results as :class:`.MapData` and :class:`gisnav_msgs.msg.OrthoImage3D`
+        message, or None if not available
+
+        Intended to be run in a WMS worker thread so that the resulting map is fully built before it is handed over to
+        :meth:`._get_map_done_callback`.
+
+        :param bbox: Bounding box of the map (left, bottom, right, top)
+        :param size: Map raster resolution (height, width)
+        :return: Tuple of map data and message, or None if not available
+        """
+        result = self._get_map(bbox, size)
+        if result is None:
+            return None
+
+        img, dem = result
+        return MapData(bbox=bbox, image=Img(img), elevation=Img(dem)), self._create_msg(bbox, img, dem)
+
+    def _get_map_done_callback(self, future: Future) -> None:
+        """Stores map data and :class:`gisnav_msgs.msg.OrthoImage3D` message from completed GetMap request
+
+        :param future: Completed future returned by :meth:`._get_map_data_and_msg`
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            # Possibly requests library related exception (see class docstring)
+            self.get_logger().error(f'GetMap request ran into an unexpected exception: {e}')
+            return
+
+        if result is None:
+            self.get_logger().warn('GetMap request did not return a map, skipping map update.')
+            return
+
+        self._map_data, self._ortho_image_3d_msg = result
 
     def image_callback(self, msg: Image) -> None:
         """Receives :class:`sensor_msgs.msg.Image` message"""
@@ -286,21 +317,33 @@ class MapNode(CameraSubscriberNode):
         :param bbox: Bounding box of latest containing camera field of view
         :return: True if new map should be requested
         """
-        if self._bounding_box is not None:
-            if self._ortho_image_3d_msg is not None:
-                bbox_previous = messaging.bounding_box_to_bbox(self._ortho_image_3d_msg.bbox)
-                threshold = self.get_parameter('map_overlap_update_threshold').get_parameter_value().double_value
-                bbox1, bbox2 = box(*bbox), box(*bbox_previous)
-                ratio1 = bbox1.intersection(bbox2).area / bbox1.area
-                ratio2 = bbox2.intersection(bbox1).area / bbox2.area
-                ratio = min(ratio1, ratio2)
-                if ratio < threshold:
-                    return True
-            else:
-                return True
-        else:
+        if self._bounding_box is None:
             return False
 
+        map_data = self._map_data
+        if map_data is None:
+            return True
+
+        # Decision only depends on the two bounding boxes and the threshold, reuse it if none of them have changed
+        threshold = self._p_map_overlap_update_threshold
+        if self._new_map_decision is not None:
+            cached_bbox, cached_map_data, cached_threshold, decision = self._new_map_decision
+            if cached_map_data is map_data and cached_threshold == threshold and cached_bbox == bbox:
+                return decision
+
+        # Map data has the same bounding box as the published OrthoImage3D message so no need to convert the message
+        bbox_previous = map_data.bbox
+        # Bounding boxes are axis-aligned so the intersection area has a closed form (no need for shapely)
+        width = min(bbox.right, bbox_previous.right) - max(bbox.left, bbox_previous.left)
+        height = min(bbox.top, bbox_previous.top) - max(bbox.bottom, bbox_previous.bottom)
+        intersection = max(0., width) * max(0., height)
+        area1 = (bbox.right - bbox.left) * (bbox.top - bbox.bottom)
+        area2 = (bbox_previous.right - bbox_previous.left) * (bbox_previous.top - bbox_previous.bottom)
+        ratio = intersection / max(area1, area2)  # Same as smaller of the two overlap ratios
+        decision = ratio < threshold
+        self._new_map_decision = bbox, map_data, threshold, decision
+        return decision
+
     def _create_publish_timer(self, publish_rate: int) -> Timer:
         """Returns a timer to publish :class:`gisnav_msgs.msg.OrthoImage3D`
 
@@ -326,24 +369,23 @@ class MapNode(CameraSubscriberNode):
         :param size: Map raster resolution (height, width)
         :return: Tuple of imagery and DEM rasters, or None if not available
         """
-        assert_type(bbox, BBox)
-        assert_type(size, tuple)
-
-        layers, styles = self.get_parameter('layers').get_parameter_value().string_array_value,\
-                         self.get_parameter('styles').get_parameter_value().string_array_value
-        assert_len(styles, len(layers))
-        assert all(isinstance(x, str) for x in layers)
-        assert all(isinstance(x, str) for x in styles)
-
-        dem_layers, dem_styles = self.get_parameter('dem_layers').get_parameter_value().string_array_value,\
-                                 self.get_parameter('dem_styles').get_parameter_value().string_array_value
-        assert_len(dem_styles, len(dem_layers))
-        assert all(isinstance(x, str) for x in dem_layers)
-        assert all(isinstance(x, str) for x in dem_styles)
-
-        srs = self.get_parameter('srs').get_parameter_value().string_value
-        format_ = self.get_parameter('format').get_parameter_value().string_value
-        transparency = self.get_parameter('transparency').get_parameter_value().bool_value
+        if __debug__:
+            assert_type(bbox, BBox)
+            assert_type(size, tuple)
+
+        layers, styles = self._p_layers, self._p_styles
+        dem_layers, dem_styles = self._p_dem_layers, self._p_dem_styles
+        if __debug__:
+            assert_len(styles, len(layers))
+            assert all(isinstance(x, str) for x in layers)
+            assert all(isinstance(x, str) for x in styles)
+            assert_len(dem_styles, len(dem_layers))
+            assert all(isinstance(x, str) for x in dem_layers)
+            assert all(isinstance(x, str) for x in dem_styles)
+
+        srs = self._p_srs
+        format_ = self._p_format
+        transparency = self._p_transparency
 
         self.get_logger().info(f'Requesting orthoimage and DEM for\n'
                                f'bbox: {bbox},\n'
@@ -356,37 +398,53 @@ class MapNode(CameraSubscriberNode):
                                f'transparency: {transparency},\n'
                                f'format: {format_}.')
 
-        # Do not handle possible requests library related exceptions here (see class docstring)
-        try:
-            self.get_logger().info(f'Requesting orthoimage...')
-            img = self._wms_client.getmap(layers=layers, styles=styles, srs=srs, bbox=bbox, size=size,
-                                          format=format_, transparent=transparency)
-        except ServiceException as se:
-            self.get_logger().error(f'GetMap request for orthoimage ran into an unexpected exception: {se}')
+        # Send DEM request to another worker thread first so that it overlaps with the orthoimage request
+        dem_future = None
+        if len(dem_layers) > 0 and dem_layers[0]:
+            dem_future = self._wms_executor.submit(self._get_map_layer, 'DEM', bbox, size, dem_layers, dem_styles,
+                                                   srs, format_, transparency, True)
+        img = self._get_map_layer('orthoimage', bbox, size, layers, styles, srs, format_, transparency)
+        dem = dem_future.result() if dem_future is not None else None
+
+        if img is None:
             return None
-        finally:
-            self.get_logger().info(f'Orthoimage request complete.')
-        img = self._read_img(img)
 
-        dem = None
-        if len(dem_layers) > 0 and dem_layers[0]:
-            try:
-                self.get_logger().info(f'Requesting DEM...')
-                dem = self._wms_client.getmap(layers=dem_layers, styles=dem_styles, srs=srs, bbox=bbox, size=size,
-                                              format=format_, transparent=transparency)
-            except ServiceException as se:
-                self.get_logger().error(f'GetMap request for DEM ran into an unexpected exception: {se}')
-                return None
-            finally:
-                self.get_logger().info(f'DEM request complete.')
-            dem = self._read_img(dem, True)
-        else:
+        if dem_future is None:
             # Assume flat (:=zero) terrain if no DEM layer provided
             self.get_logger().debug(f'No DEM layer provided, assuming flat (=zero) elevation model.')
             dem = np.zeros_like(img)
+        elif dem is None:
+            return None
 
         return img, dem
 
+    def _get_map_layer(self, name: str, bbox: BBox, size: Tuple[int, int], layers: List[str], styles: List[str],
+                       srs: str, format_: str, transparency: bool, grayscale: bool = False) -> Optional[np.ndarray]:
+        """Sends GetMap request to WMS for given layers and returns the decoded raster, or None if not available
+
+        :param name: Name of the raster for logging (e.g. 'orthoimage' or 'DEM')
+        :param bbox: Bounding box of the map (left, bottom, right, top)
+        :param size: Map raster resolution (height, width)
+        :param layers: WMS GetMap request layers parameter
+        :param styles: WMS GetMap request styles parameter
+        :param srs: WMS GetMap request SRS parameter
+        :param format_: WMS GetMap request image format
+        :param transparency: WMS GetMap request image transparency
+        :param grayscale: Set True to decode the raster as grayscale (e.g. DEM)
+        :return: Decoded raster, or None if not available
+        """
+        # Do not handle possible requests library related exceptions here (see class docstring)
+        try:
+            self.get_logger().info(f'Requesting {name}...')
+            raster = self._wms_client.getmap(layers=layers, styles=styles, srs=srs, bbox=bbox, size=size,
+                                             format=format_, transparent=transparency)
+        except ServiceException as se:
+            self.get_logger().error(f'GetMap request for {name} ran into an unexpected exception: {se}')
+            return None
+        finally:
+            self.get_logger().info(f'Request for {name} complete.')
+        return self._read_img(raster, grayscale)
+
     @staticmethod
     def _read_img(img: bytes, grayscale: bool = False) -> np.ndarray:
         """Reads image bytes and returns numpy array
@@ -395,8 +453,9 @@ class MapNode(CameraSubscriberNode):
         """
         img = np.frombuffer(img.read(), np.uint8)
         img = cv2.imdecode(img, cv2.IMREAD_UNCHANGED) if not grayscale else cv2.imdecode(img, cv2.IMREAD_GRAYSCALE)
-        assert_type(img, np.ndarray)
-        #assert_ndim(img, 3)
+        if __debug__:
+            assert_type(img, np.ndarray)
+            #assert_ndim(img, 3)
         return img
 
     def _create_msg(self, bbox: BBox, img: np.ndarray, dem: np.ndarray) -> OrthoImage3D:
@@ -423,16 +482,15 @@ class MapNode(CameraSubscriberNode):
         map_data = self._map_data if not local_origin else self._home_dem
         if map_data is not None and position is not None:
             elevation = map_data.elevation.arr
-            bbox = map_data.bbox
-            polygon = box(*bbox)
-            point = position._geoseries[0]
+            left, bottom, right, top = map_data.bbox
+            lat, lon = position.latlon
 
-            if polygon.contains(point):
+            # Bounding box is axis-aligned so a plain bounds check is enough (no need for shapely)
+            if left < lon < right and bottom < lat < top:
                 h, w = elevation.shape[0:2]
                 assert h, w == self._img_dim
-                left, bottom, right, top = bbox
-                x = w * (position.lon - left) / (right - left)
-                y = h * (position.lat - bottom) / (top - bottom)
+                x = w * (lon - left) / (right - left)
+                y = h * (lat - bottom) / (top - bottom)
                 try:
                     dem_elevation = elevation[int(np.floor(y)), int(np.floor(x))]
                 except IndexError as _:
@@ -477,6 +535,10 @@ class MapNode(CameraSubscriberNode):
         :return: True if new map should be requested
         """
         # TODO: re-request if home position/local frame origin has changed? currently they are assumed equal
+        if self._home_dem_future is not None and not self._home_dem_future.done():
+            self.get_logger().debug(f'Not requesting DEM because previous request is still pending.')
+            return False
+
         if self._origin_dem_altitude is not None:
             self.get_logger().debug(f'Not requesting DEM because origin_dem_altitude is already set.')
             return False
@@ -569,14 +631,8 @@ class MapNode(CameraSubscriberNode):
             bbox = BBox(*map_candidate.bounds)
             if self.map_size_with_padding is not None:
                 self.get_logger().info(f'Requesting DEM for home/local frame origin (assumed same!).')
-                img, dem = self._get_map(bbox, self.map_size_with_padding)
-                self._home_dem = MapData(bbox=bbox, image=Img(img), elevation=Img(dem))
-
-                # TODO: assumes that this local_frame_origin is the starting location, same that was used for the request
-                #  --> not strictly true even if it works for the simulation
-                if self._origin_dem_altitude is None:
-                    if self._home_geopoint is not None:
-                        self._origin_dem_altitude = self._terrain_altitude_at_position(xy, local_origin=True)
+                self._home_dem_future = self._wms_executor.submit(self._get_map, bbox, self.map_size_with_padding)
+                self._home_dem_future.add_done_callback(partial(self._get_home_dem_done_callback, bbox, xy))
             else:
                 self.get_logger().warn('Required map size unknown, skipping requesting DEM for home.')
 
@@ -584,3 +640,39 @@ class MapNode(CameraSubscriberNode):
             self._ortho_image_3d_pub.publish(self._ortho_image_3d_msg)
 
         self._publish_terrain_altitude()
+
+    def _get_home_dem_done_callback(self, bbox: BBox, xy: GeoPt, future: Future) -> None:
+        """Stores DEM for home (assumed local frame origin) from completed GetMap request
+
+        :param bbox: Bounding box of the requested map
+        :param xy: Home position used for the request
+        :param future: Completed future returned by :meth:`._get_map`
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            # Possibly requests library related exception (see class docstring)
+            self.get_logger().error(f'GetMap request for home DEM ran into an unexpected exception: {e}')
+            return
+
+        if result is None:
+            self.get_logger().warn('GetMap request for home DEM did not return a map, will try again.')
+            return
+
+        img, dem = result
+        self._home_dem = MapData(bbox=bbox, image=Img(img), elevation=Img(dem))
+
+        # TODO: assumes that this local_frame_origin is the starting location, same that was used for the request
+        #  --> not strictly true even if it works for the simulation
+        if self._origin_dem_altitude is None:
+            self._origin_dem_altitude = self._terrain_altitude_at_position(xy, local_origin=True)
+
+    def destroy_node(self) -> None:
+        """Shuts down GetMap request worker threads when node is destroyed"""
+        # Cancel pending work manually instead of using shutdown(cancel_futures=True) which requires Python 3.9+
+        if self._wms_future is not None:
+            self._wms_future.cancel()
+        if self._home_dem_future is not None:
+            self._home_dem_future.cancel()
+        self._wms_executor.shutdown(wait=False)
+        super().destroy_node()
@@ -1,9 +1,11 @@
 """Helper functions for ROS messaging"""
+import sys
 import time
 import numpy as np
-from typing import Union
+from typing import Union, Optional
 
 from std_msgs.msg import Header
+from sensor_msgs.msg import Image
 from geometry_msgs.msg import Quaternion
 from geographic_msgs.msg import GeoPoint, GeoPointStamped, BoundingBox
 
@@ -53,6 +55,19 @@ ROS_TOPIC_SENSOR_GPS = '/fmu/sensor_gps/in'
 """Name of ROS topic for outgoing :class:`px4_msgs.msg.SensorGps` messages over PX4 microRTPS bridge"""
 # endregion ROS topic names
 
+_IMAGE_ENCODINGS = {
+    'bgr8': (np.uint8, 3),
+    'rgb8': (np.uint8, 3),
+    'mono8': (np.uint8, 1),
+    'mono16': (np.uint16, 1),
+    '8UC1': (np.uint8, 1),
+    '8UC3': (np.uint8, 3),
+    '16UC1': (np.uint16, 1),
+    '32FC1': (np.float32, 1),
+}
+""":class:`sensor_msgs.msg.Image` encodings that can be viewed as NumPy arrays without conversion, mapped to their
+NumPy dtype and number of channels"""
+
 
 def create_header(frame_id: str = '') -> Header:
     """Creates a class:`std_msgs.msg.Header` for an outgoing ROS message
@@ -84,9 +99,11 @@ def as_ros_quaternion(q: np.ndarray) -> Quaternion:
     :param q: NumPy array quaternion of shape in (x, y, z, w) format
     :return: ROS quaternion message
     """
-    assert_type(q, np.ndarray)
+    if __debug__:
+        assert_type(q, np.ndarray)
     q = q.squeeze()
-    assert_shape(q, (4,))
+    if __debug__:
+        assert_shape(q, (4,))
     return Quaternion(x=q[0].item(), y=q[1].item(), z=q[2].item(), w=q[3].item())
 
 
@@ -113,7 +130,8 @@ def wxyz_to_xyzw_q(q: np.ndarray) -> np.ndarray:
     :return: Quaternion in (x, y, z, w) format
     """
     q_out = q.squeeze()
-    assert_shape(q_out, (4,))
+    if __debug__:
+        assert_shape(q_out, (4,))
     q_out = np.append(q_out[1:], q_out[0])
     q_out = q_out.reshape(q.shape)  # Re-add potential padding
     return q_out
@@ -143,3 +161,30 @@ def bbox_to_bounding_box(bbox: BBox) -> BoundingBox:
 def bounding_box_to_bbox(msg: BoundingBox) -> BBox:
     """Converts :class:`geographic_msgs.msg.BoundingBox` to :class:`.BBox`"""
     return BBox(msg.min_pt.longitude, msg.min_pt.latitude, msg.max_pt.longitude, msg.max_pt.latitude)
+
+
+def image_to_np(msg: Image) -> Optional[np.ndarray]:
+    """Returns read-only NumPy view of :class:`sensor_msgs.msg.Image` message data without copying, or None if the
+    message cannot be viewed directly
+
+    Messages with an encoding not listed in :py:attr:`._IMAGE_ENCODINGS`, with row padding, or with non-native byte
+    order cannot be viewed directly and should be converted with :class:`cv_bridge.CvBridge` instead.
+
+    :param msg: Image message
+    :return: Image array of shape (height, width) or (height, width, channels), or None if not available
+    """
+    dtype, channels = _IMAGE_ENCODINGS.get(msg.encoding, (None, None))
+    if dtype is None:
+        return None
+
+    dtype = np.dtype(dtype)
+    if msg.step != msg.width * channels * dtype.itemsize:
+        return None
+
+    if dtype.itemsize > 1 and bool(msg.is_bigendian) != (sys.byteorder == 'big'):
+        return None
+
+    shape = (msg.height, msg.width) if channels == 1 else (msg.height, msg.width, channels)
+    arr = np.frombuffer(msg.data, dtype=dtype).reshape(shape)
+    arr.flags.writeable = False
+    return arr
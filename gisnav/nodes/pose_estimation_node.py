@@ -3,13 +3,14 @@ import os
 import sys
 import yaml
 import numpy as np
-import traceback
 import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
 from typing import Optional, Union, List, Tuple, get_args
 
 import cv2
 from ament_index_python.packages import get_package_share_directory
-from scipy.spatial.transform import Rotation
 from rclpy.qos import QoSPresetProfiles
 from cv_bridge import CvBridge
 from geometry_msgs.msg import Pose
@@ -25,7 +26,12 @@ from ..pose_estimators.pose_estimator import PoseEstimator
 from ..assertions import assert_type, assert_ndim, assert_shape
 from ..data import Pose, FixedCamera, DataValueError, ImageData, Img, Attitude, ContextualMapData, MapData, ImagePair, \
     Position
-from ..geo import GeoPt, GeoTrapezoid
+
+try:
+    # LibYAML based loader is much faster than the pure Python implementation
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 
 
 class PoseEstimationNode(CameraSubscriberNode):
@@ -38,6 +44,33 @@ class PoseEstimationNode(CameraSubscriberNode):
     # e.g. gscam2 only supports bgr8 so this is used to override encoding in image header
     _IMAGE_ENCODING = 'bgr8'
 
+    # Camera yaw deviations from north smaller than this (in radians) are snapped to zero so that the reference map
+    # does not need to be rotated
+    _MAP_ROTATION_THRESHOLD = np.radians(1)
+
+    _MAP_ROTATION_RESOLUTION = np.radians(1)
+    """Camera yaw is rounded to this resolution (in radians) before rotating the reference map so that rotated maps
+    can be reused between frames when the camera yaw has not changed significantly"""
+
+    # Classes resolved by _import_class, keyed by (module name, class name), shared by all instances
+    _imported_classes = {}
+
+    _PHASE_CORRELATION_SCALING = 0.25
+    """Scaling factor for query images before phase correlation against the latest keyframe"""
+
+    _PHASE_CORRELATION_MIN_RESPONSE = 0.6
+    """Minimum phase correlation response for reusing the keyframe pose estimate"""
+
+    _PHASE_CORRELATION_MAX_SHIFT = 1.
+    """Maximum shift in (scaled) pixels between query image and keyframe for reusing the keyframe pose estimate"""
+
+    _KEYFRAME_MAX_ALTITUDE_DIFFERENCE = 1.
+    """Maximum difference in meters between vehicle altitude above ground and keyframe altitude above ground for
+    reusing the keyframe pose estimate"""
+
+    _SKIP_FRAME_LOG_THROTTLE = 1.
+    """Minimum interval in seconds between repeated per-frame 'skipping' warnings from the same call site"""
+
     ROS_D_POSE_ESTIMATOR_PARAMS = 'launch/params/pose_estimators/loftr_params.yaml'
     """Default parameters for initializing :class:`.PoseEstimator`"""
 
@@ -47,6 +80,12 @@ class PoseEstimationNode(CameraSubscriberNode):
     Set to '' to disable
     """
 
+    ROS_D_DEBUG_VISUALIZE = False
+    """Default flag for displaying projected field of view estimates in an OpenCV window
+
+    Disabled by default so that the drawing and display overhead is only paid when someone is actually looking
+    """
+
     ROS_D_MISC_MAX_PITCH = 30
     """Default maximum camera pitch from nadir in degrees for attempting to estimate pose against reference map
 
@@ -67,6 +106,7 @@ class PoseEstimationNode(CameraSubscriberNode):
         ('min_match_altitude', ROS_D_MISC_MIN_MATCH_ALTITUDE, False),
         ('attitude_deviation_threshold', ROS_D_MISC_ATTITUDE_DEVIATION_THRESHOLD, False),
         ('export_position', ROS_D_DEBUG_EXPORT_POSITION, False),
+        ('visualize', ROS_D_DEBUG_VISUALIZE, False),
     ]
     """List containing ROS parameter name, default value and read_only flag tuples"""
 
@@ -84,10 +124,32 @@ class PoseEstimationNode(CameraSubscriberNode):
         module_name, class_name = params.get('class_name', '').rsplit('.', 1)
         pose_estimator: PoseEstimator = self._import_class(class_name, module_name)
         self._estimator = pose_estimator(*params.get('args', []))
+
+        # Pose estimation is run in a worker thread so that it does not block the executor
+        self._pose_estimation_executor = ThreadPoolExecutor(max_workers=1)
+        self._pose_estimation_future = None
+        # Guards dispatching of frames to the worker and post-processing of estimates from both the executor and the
+        # worker thread (re-entrant because done callbacks run immediately in the dispatching thread if the future has
+        # already completed)
+        self._pose_estimation_lock = threading.RLock()
+        # Latest (image message, timestamp) received while worker was busy, processed once the worker becomes idle
+        self._pending_image = None
+        # Latest successfully estimated frame (scaled grayscale query image, image pair, pose) used to skip pose
+        # estimation for frames that have not moved
+        self._keyframe = None
         # endregion setup pose estimator
 
+        # Debug visualization is drawn and displayed in a dedicated thread so that it does not delay publishing, and so
+        # that all OpenCV GUI calls are made from the same thread
+        self._visualization_executor = ThreadPoolExecutor(max_workers=1)
+        self._visualization_future = None
+
         self._map_data = None
 
+        # Attitudes derived from gimbal quaternion, cached per gimbal quaternion message
+        self.__gimbal_attitude = None, None  # (gimbal quaternion message, gimbal attitude)
+        self.__r_guess = None, None  # (gimbal quaternion message, gimbal rotation matrix guess)
+
         # Converts image_raw to cv2 compatible image
         self._cv_bridge = CvBridge()
 
@@ -145,11 +207,17 @@ class PoseEstimationNode(CameraSubscriberNode):
         :param module_name: Name of module that contains the class
         :return: Imported class
         """
-        if module_name not in sys.modules:
+        imported_class = self._imported_classes.get((module_name, class_name), None)
+        if imported_class is not None:
+            return imported_class
+
+        module = sys.modules.get(module_name, None)
+        if module is None:
             self.get_logger().info(f'Importing module {module_name}.')
-            importlib.import_module(module_name)
-        imported_class = getattr(sys.modules[module_name], class_name, None)
+            module = importlib.import_module(module_name)
+        imported_class = getattr(module, class_name, None)
         assert imported_class is not None, f'{class_name} was not found in module {module_name}.'
+        self._imported_classes[(module_name, class_name)] = imported_class
         return imported_class
 
     def _load_config(self, yaml_file: str) -> dict:
@@ -162,43 +230,67 @@ class PoseEstimationNode(CameraSubscriberNode):
         with open(os.path.join(self._package_share_dir, yaml_file), 'r') as f:
             # noinspection PyBroadException
             try:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_SafeLoader)
                 self.get_logger().info(f'Loaded params:\n{config}.')
                 return config
             except Exception as e:
                 self.get_logger().error(f'Could not load params file {yaml_file} because of unexpected exception.')
                 raise
 
+    @property
+    def _pose_estimation_results_pending(self) -> bool:
+        """True if there is a pending pose estimation"""
+        return self._pose_estimation_future is not None and not self._pose_estimation_future.done()
+
     @property
     def _altitude_scaling(self) -> Optional[float]:
         """Returns camera focal length divided by camera altitude in meters"""
-        if self.camera_data is not None and self._vehicle_altitude is not None:
-            return self.camera_data.fx / self._vehicle_altitude.terrain  # TODO: assumes fx == fy
+        camera_data, vehicle_altitude = self.camera_data, self._vehicle_altitude
+        if camera_data is not None and vehicle_altitude is not None:
+            return camera_data.fx / vehicle_altitude.terrain  # TODO: assumes fx == fy
         else:
             self.get_logger().warn('Could not estimate elevation scale because camera focal length and/or vehicle '
                                    'altitude is unknown.')
             return None
 
+    @property
+    def _gimbal_attitude(self) -> Optional[Attitude]:
+        """Gimbal attitude (with extrinsic Euler angles) from latest gimbal quaternion, or None if not available"""
+        gimbal_quaternion = self._gimbal_quaternion
+        if gimbal_quaternion is None:
+            return None
+
+        cached_quaternion, cached_attitude = self.__gimbal_attitude
+        if gimbal_quaternion is cached_quaternion:
+            return cached_attitude
+
+        gimbal_attitude = Attitude(q=messaging.as_np_quaternion(gimbal_quaternion), extrinsic=True)
+        self.__gimbal_attitude = gimbal_quaternion, gimbal_attitude
+        return gimbal_attitude
+
     @property
     def _r_guess(self) -> Optional[np.ndarray]:
         """Gimbal rotation matrix guess"""
-        if self._gimbal_quaternion is None:
+        gimbal_quaternion = self._gimbal_quaternion
+        if gimbal_quaternion is None:
             self.get_logger().warn('Gimbal set attitude not available, will not provide pose guess.')
             return None
-        else:
-            gimbal_attitude = Attitude(q=messaging.as_np_quaternion(self._gimbal_quaternion))
-            gimbal_attitude = gimbal_attitude.to_esd()  # Need coordinates in image frame, not NED
-            return gimbal_attitude.r
 
-    @property
-    def _contextual_map_data(self) -> Optional[ContextualMapData]:
-        """Returns contextual (rotated) map data for pose estimation
+        cached_quaternion, cached_r_guess = self.__r_guess
+        if gimbal_quaternion is cached_quaternion:
+            return cached_r_guess
 
-        :return: Rotated map with associated metadata, or None if not available
-        """
-        # Get cropped and rotated map
-        if self._gimbal_quaternion is not None:
-            gimbal_attitude = Attitude(q=messaging.as_np_quaternion(self._gimbal_quaternion), extrinsic=True)
+        gimbal_attitude = Attitude(q=messaging.as_np_quaternion(gimbal_quaternion))
+        r_guess = gimbal_attitude.to_esd_r()  # Need coordinates in image frame, not NED
+        self.__r_guess = gimbal_quaternion, r_guess
+        return r_guess
+
+    @property
+    def _map_rotation(self) -> Optional[float]:
+        """Camera yaw rounded to :py:attr:`._MAP_ROTATION_RESOLUTION` for rotating the reference map, or None if
+        not available"""
+        gimbal_attitude = self._gimbal_attitude
+        if gimbal_attitude is not None:
             roll = gimbal_attitude.roll
             camera_yaw = gimbal_attitude.yaw
             if abs(roll) > np.pi / 2:
@@ -210,12 +302,25 @@ class PoseEstimationNode(CameraSubscriberNode):
                 self.get_logger().debug(f'Gimbal absolute Euler roll angle over 90 degrees: assuming gimbal is not '
                                         f'upside down and that gimbal absolute pitch is over 90 degrees instead.')
                 camera_yaw = (camera_yaw + np.pi / 2) % (2 * np.pi)
-            assert_type(camera_yaw, float)
-            assert -2 * np.pi <= camera_yaw <= 2 * np.pi, f'Unexpected gimbal yaw value: {camera_yaw} ([-2*pi, 2*pi] expected).'
+            if __debug__:
+                assert_type(camera_yaw, float)
+                assert -2 * np.pi <= camera_yaw <= 2 * np.pi, f'Unexpected gimbal yaw value: {camera_yaw} ' \
+                                                               f'([-2*pi, 2*pi] expected).'
+            if abs((camera_yaw + np.pi) % (2 * np.pi) - np.pi) < self._MAP_ROTATION_THRESHOLD:
+                camera_yaw = 0.
+            else:
+                camera_yaw = round(camera_yaw / self._MAP_ROTATION_RESOLUTION) * self._MAP_ROTATION_RESOLUTION
+            return camera_yaw
         else:
             self.get_logger().warn(f'Camera yaw unknown, cannot estimate pose.')
             return None
 
+    def _contextual_map_data(self, camera_yaw: float) -> ContextualMapData:
+        """Returns contextual (rotated) map data for pose estimation
+
+        :param camera_yaw: Rounded camera yaw from :py:attr:`._map_rotation`
+        :return: Rotated map with associated metadata
+        """
         return ContextualMapData(rotation=camera_yaw, map_data=self._map_data, crop=self.img_dim,
                                  altitude_scaling=self._altitude_scaling)
 
@@ -227,28 +332,32 @@ class PoseEstimationNode(CameraSubscriberNode):
 
         :return: True if pose estimation be attempted
         """
+        # Checks are ordered from cheapest to most expensive
         # Check condition (1) - that MapData exists
         if self._map_data is None:
-            self.get_logger().warn(f'No reference map available. Skipping pose estimation.')
-            return False
-
-        # Check condition (2) - whether camera roll/pitch is too large
-        max_pitch = self.get_parameter('max_pitch').get_parameter_value().integer_value
-        if self._camera_roll_or_pitch_too_high(max_pitch):
-            self.get_logger().warn(f'Camera roll or pitch not available or above limit {max_pitch}. Skipping pose '
-                                   f'estimation.')
+            self.get_logger().warn('No reference map available. Skipping pose estimation.',
+                                   throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return False
 
         # Check condition (3) - whether vehicle altitude is too low
-        min_alt = self.get_parameter('min_match_altitude').get_parameter_value().integer_value
+        min_alt = self._p_min_match_altitude
         assert min_alt > 0
-        if self._vehicle_altitude is None or self._vehicle_altitude.terrain is np.nan:
-            self.get_logger().warn('Cannot determine altitude AGL, skipping map update.')
+        vehicle_altitude = self._vehicle_altitude
+        if vehicle_altitude is None or vehicle_altitude.terrain is np.nan:
+            self.get_logger().warn('Cannot determine altitude AGL, skipping map update.',
+                                   throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return False
-        if self._vehicle_altitude.terrain < min_alt:
-            self.get_logger().warn(f'Assumed altitude {self._vehicle_altitude.terrain} was lower than minimum '
+        if vehicle_altitude.terrain < min_alt:
+            self.get_logger().warn(f'Assumed altitude {vehicle_altitude.terrain} was lower than minimum '
                                    f'threshold for matching ({min_alt}) or could not be determined. Skipping pose '
-                                   f'estimation.')
+                                   f'estimation.', throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
+            return False
+
+        # Check condition (2) - whether camera roll/pitch is too large
+        max_pitch = self._p_max_pitch
+        if self._camera_roll_or_pitch_too_high(max_pitch):
+            self.get_logger().warn(f'Camera roll or pitch not available or above limit {max_pitch}. Skipping pose '
+                                   f'estimation.', throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return False
 
         return True
@@ -258,46 +367,176 @@ class PoseEstimationNode(CameraSubscriberNode):
 
         :param msg: The :class:`sensor_msgs.msg.Image` message
         """
-        cv_image = self._cv_bridge.imgmsg_to_cv2(msg, self._IMAGE_ENCODING)
+        timestamp = self.usec
+        with self._pose_estimation_lock:
+            if self._pose_estimation_results_pending:
+                # Previous frame still being processed, keep only the latest frame for when the worker becomes idle
+                self._pending_image = msg, timestamp
+                return None
 
-        # Check that image dimensions match declared dimensions
-        if self.img_dim is not None:
-            cv_img_shape = cv_image.shape[0:2]
-            assert cv_img_shape == self.img_dim, f'Converted cv_image shape {cv_img_shape} did not match ' \
-                                                  f'declared image shape {self.img_dim}.'
+            self._process_image(msg, timestamp)
 
-        if self.camera_data is None:
-            self.get_logger().warn('Camera data not yet available, skipping frame.')
+    def _process_pending_image(self) -> None:
+        """Processes latest image received while pose estimation worker was busy, if any"""
+        with self._pose_estimation_lock:
+            pending_image, self._pending_image = self._pending_image, None
+            if pending_image is not None and not self._pose_estimation_results_pending:
+                self._process_image(*pending_image)
+
+    def _process_image(self, msg: Image, timestamp: int) -> None:
+        """Estimates pose for :class:`sensor_msgs.msg.Image` message or skips it if pose should not be estimated
+
+        :param msg: The :class:`sensor_msgs.msg.Image` message
+        :param timestamp: Time when image message was received (microseconds)
+        """
+        # Do cheap checks before converting the image so that skipped frames cost as little as possible
+        camera_data = self.camera_data
+        if camera_data is None:
+            self.get_logger().warn('Camera data not yet available, skipping frame.',
+                                   throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return None
 
-        image_data = ImageData(image=Img(cv_image), frame_id=msg.header.frame_id, timestamp=self.usec,
-                               camera_data=self.camera_data)
+        if not self._should_estimate():
+            return None
 
-        if self._should_estimate():
-            assert self._map_data is not None
-            assert self.camera_data is not None
-            assert hasattr(self._map_data, 'image'), 'Map data unexpectedly did not contain the image data.'
+        cv_image = self._image_msg_to_cv2(msg)
 
-            image_pair = ImagePair(image_data, self._contextual_map_data)
-            pose = self._estimator.estimate(image_data.image.arr, image_pair.ref.image.arr, self.camera_data.k)
-            if pose is not None:
-                pose = Pose(*pose)
-                self._post_process_pose(pose, image_pair)
-            else:
-                self.get_logger().warn(f'Could not estimate a pose, skipping this frame.')
+        # Check that image dimensions match declared dimensions
+        cv_img_shape = cv_image.shape[0:2]
+        assert cv_img_shape == camera_data.dim, f'Converted cv_image shape {cv_img_shape} did not match ' \
+                                                f'declared image shape {camera_data.dim}.'
+
+        image_data = ImageData(image=Img(cv_image), frame_id=msg.header.frame_id, timestamp=timestamp,
+                               camera_data=camera_data)
+
+        assert self._map_data is not None
+        assert hasattr(self._map_data, 'image'), 'Map data unexpectedly did not contain the image data.'
+
+        camera_yaw = self._map_rotation
+        if camera_yaw is None:
+            return None
+
+        # Vehicle altitude availability is checked in _should_estimate
+        altitude = self._vehicle_altitude.terrain
+        phase_img = self._phase_correlation_image(image_data.image.gray)
+        keyframe = self._keyframe
+        if keyframe is not None:
+            keyframe_phase_img, keyframe_image_pair, keyframe_pose, keyframe_altitude = keyframe
+            # Phase correlation only detects translation, so changes in camera yaw and altitude (scale) must be
+            # checked separately before the keyframe pose can be assumed to still be valid
+            if keyframe_image_pair.ref.map_data is self._map_data \
+                    and keyframe_image_pair.ref.rotation == camera_yaw \
+                    and abs(altitude - keyframe_altitude) <= self._KEYFRAME_MAX_ALTITUDE_DIFFERENCE \
+                    and self._is_stationary(keyframe_phase_img, phase_img):
+                # Camera has not moved since keyframe, reuse keyframe pose and reference instead of estimating
+                self._post_process_pose(keyframe_pose, ImagePair(image_data, keyframe_image_pair.ref))
                 return None
 
+        image_pair = ImagePair(image_data, self._contextual_map_data(camera_yaw))
+        self._pose_estimation_future = self._pose_estimation_executor.submit(
+            self._estimator.estimate, image_data.image.gray, image_pair.ref.image.gray, camera_data.k
+        )
+        self._pose_estimation_future.add_done_callback(partial(self._pose_estimation_done_callback, image_pair,
+                                                               phase_img, altitude))
+        self._pose_estimation_future.add_done_callback(lambda _: self._process_pending_image())
+
+    def _image_msg_to_cv2(self, msg: Image) -> np.ndarray:
+        """Converts :class:`sensor_msgs.msg.Image` message to cv2 compatible image
+
+        Images that are already in :py:attr:`._IMAGE_ENCODING` are wrapped as a read-only view of the message buffer
+        without copying when possible (see :func:`.messaging.image_to_np`). Other images are converted with
+        :class:`cv_bridge.CvBridge`.
+
+        :param msg: The :class:`sensor_msgs.msg.Image` message
+        :return: Image in :py:attr:`._IMAGE_ENCODING`
+        """
+        img = messaging.image_to_np(msg) if msg.encoding == self._IMAGE_ENCODING else None
+        if img is None:
+            img = self._cv_bridge.imgmsg_to_cv2(msg, self._IMAGE_ENCODING)
+        return img
+
+    def _passthrough_image_msg_to_cv2(self, msg: Image) -> np.ndarray:
+        """Converts :class:`sensor_msgs.msg.Image` message to cv2 compatible image without changing its encoding
+
+        :param msg: The :class:`sensor_msgs.msg.Image` message
+        :return: Image in its original encoding
+        """
+        img = messaging.image_to_np(msg)
+        if img is None:
+            img = self._cv_bridge.imgmsg_to_cv2(msg, desired_encoding='passthrough')
+        return img
+
+    def _phase_correlation_image(self, img: np.ndarray) -> np.ndarray:
+        """Returns scaled version of grayscale image for phase correlation
+
+        :param img: Grayscale query image
+        :return: Scaled single channel float32 image
+        """
+        scaling = self._PHASE_CORRELATION_SCALING
+        return np.float32(cv2.resize(img, None, fx=scaling, fy=scaling, interpolation=cv2.INTER_AREA))
+
+    def _is_stationary(self, keyframe_img: np.ndarray, img: np.ndarray) -> bool:
+        """Returns True if image has not moved in relation to keyframe image based on phase correlation
+
+        :param keyframe_img: Scaled grayscale keyframe image from :meth:`._phase_correlation_image`
+        :param img: Scaled grayscale query image from :meth:`._phase_correlation_image`
+        :return: True if phase correlation is confident that there is no significant shift between the images
+        """
+        if keyframe_img.shape != img.shape:
+            return False
+
+        (dx, dy), response = cv2.phaseCorrelate(keyframe_img, img)
+        max_shift = self._PHASE_CORRELATION_MAX_SHIFT
+        return response > self._PHASE_CORRELATION_MIN_RESPONSE and abs(dx) < max_shift and abs(dy) < max_shift
+
+    def _pose_estimation_done_callback(self, image_pair: ImagePair, phase_img: np.ndarray, altitude: float,
+                                       future: Future) -> None:
+        """Handles completed pose estimation
+
+        :param image_pair: Image pair input from which pose was estimated
+        :param phase_img: Scaled grayscale query image from :meth:`._phase_correlation_image`
+        :param altitude: Vehicle altitude above ground at the time the query image was captured
+        :param future: Completed future returned by :meth:`.PoseEstimator.estimate`
+        """
+        try:
+            pose = future.result()
+        except Exception as e:
+            self.get_logger().error(f'Pose estimation ran into an unexpected exception: {e}')
+            return None
+
+        if pose is None:
+            self.get_logger().warn(f'Could not estimate a pose, skipping this frame.')
+            return None
+
+        try:
+            pose = Pose(*pose)
+        except DataValueError as _:
+            self.get_logger().warn(f'Estimated pose was not valid, skipping this frame.')
+            return None
+
+        # Post-processing runs in the worker thread, serialize it with the keyframe reuse path in the image callback
+        # so that both do not update the keyframe, cached attitudes and debug outputs concurrently
+        with self._pose_estimation_lock:
+            if self._post_process_pose(pose, image_pair):
+                self._keyframe = phase_img, image_pair, pose, altitude
+
     def _orthoimage_3d_callback(self, msg: OrthoImage3D) -> None:
         """Handles latest :class:`gisnav_msgs.msg.OrthoImage3D` message
 
         :param msg: Latest :class:`gisnav_msgs.msg.OrthoImage3D` message
         """
         bbox = messaging.bounding_box_to_bbox(msg.bbox)
-        img = self._cv_bridge.imgmsg_to_cv2(msg.img, desired_encoding='passthrough')
-        dem = self._cv_bridge.imgmsg_to_cv2(msg.dem, desired_encoding='passthrough')
-        assert_type(img, np.ndarray)
-        assert_ndim(dem, 2)
-        assert_shape(dem, img.shape[0:2])
+        map_data = self._map_data
+        if map_data is not None and map_data.bbox == bbox:
+            # Same map republished by MapNode, keep existing map data so that anything derived from it stays valid
+            return None
+
+        img = self._passthrough_image_msg_to_cv2(msg.img)
+        dem = self._passthrough_image_msg_to_cv2(msg.dem)
+        if __debug__:
+            assert_type(img, np.ndarray)
+            assert_ndim(dem, 2)
+            assert_shape(dem, img.shape[0:2])
 
         assert self.map_size_with_padding is not None
 
@@ -353,11 +592,12 @@ class PoseEstimationNode(CameraSubscriberNode):
         """
         self._vehicle_geopose = msg
 
-    def _post_process_pose(self, pose: Pose, image_pair: ImagePair) -> None:
+    def _post_process_pose(self, pose: Pose, image_pair: ImagePair) -> bool:
         """Handles estimated pose
 
         :param pose: Pose result from pose estimation node worker
         :param image_pair: Image pair input from which pose was estimated
+        :return: True if estimate was valid and position was published
         """
         try:
             # Compute DEM value at estimated position
@@ -369,11 +609,11 @@ class PoseEstimationNode(CameraSubscriberNode):
             pose = Pose(pose.r, pose.t - elevation)
         except DataValueError as _:
             self.get_logger().warn(f'Estimated pose was not valid, skipping this frame.')
-            return None
+            return False
         except IndexError as __:
             # TODO: might be able to handle this
             self.get_logger().warn(f'Estimated pose was not valid, skipping this frame.')
-            return None
+            return False
 
         try:
             assert self._terrain_geopoint is not None
@@ -385,32 +625,45 @@ class PoseEstimationNode(CameraSubscriberNode):
                                        timestamp=image_pair.qry.timestamp)
         except DataValueError as _:
             self.get_logger().warn(f'Could not estimate a valid camera position, skipping this frame.')
-            return None
+            return False
 
         if not self._is_valid_estimate(fixed_camera, self._r_guess):
             self.get_logger().warn('Estimate did not pass post-estimation validity check, skipping this frame.')
-            return None
+            return False
 
         assert fixed_camera is not None
         # noinspection PyUnreachableCode
         if __debug__:
-            # Visualize projected FOV estimate
-            fov_pix = fixed_camera.fov.fov_pix
-            ref_img = fixed_camera.image_pair.ref.image.arr
-            map_with_fov = cv2.polylines(ref_img.copy(),
-                                         [np.int32(fov_pix)], True,
-                                         255, 3, cv2.LINE_AA)
-
-            img = np.vstack((map_with_fov, fixed_camera.image_pair.qry.image.arr))
-            cv2.imshow("Projected FOV", img)
-            cv2.waitKey(1)
+            # Skip visualizing this estimate if the previous one is still being displayed
+            if self._p_visualize and (self._visualization_future is None or self._visualization_future.done()):
+                self._visualization_future = self._visualization_executor.submit(
+                    self._visualize_fov, fixed_camera.image_pair.ref.image.arr, fixed_camera.image_pair.qry.image.arr,
+                    fixed_camera.fov.fov_pix
+                )
 
             # Export GeoJSON
-            export_geojson = self.get_parameter('export_position').get_parameter_value().string_value
+            export_geojson = self._p_export_position
             if export_geojson != '':
                 self._export_position(fixed_camera.position.xy, fixed_camera.fov.fov, export_geojson)
 
         self.publish(fixed_camera.position)
+        return True
+
+    @staticmethod
+    def _visualize_fov(ref_img: np.ndarray, qry_img: np.ndarray, fov_pix: np.ndarray) -> None:
+        """Displays projected field of view on reference map above query image
+
+        Intended to be run in the visualization thread (see :meth:`._post_process_pose`).
+
+        :param ref_img: Reference map image
+        :param qry_img: Query image
+        :param fov_pix: Projected field of view in reference map pixel coordinates
+        """
+        # Draw directly into the stacked image to avoid an extra copy of the reference image
+        img = np.vstack((ref_img, qry_img))
+        cv2.polylines(img[:ref_img.shape[0]], [np.int32(fov_pix)], True, 255, 3, cv2.LINE_AA)
+        cv2.imshow("Projected FOV", img)
+        cv2.waitKey(1)
 
     def _is_valid_estimate(self, fixed_camera: FixedCamera, r_guess_: np.ndarray) -> bool:
         """Returns True if the estimate is valid
@@ -424,17 +677,17 @@ class PoseEstimationNode(CameraSubscriberNode):
                                    'validity check.')
             return False
 
-        r_guess = Rotation.from_matrix(r_guess_)
-        # Adjust for map rotation
+        # Adjust for map rotation (rotation around z-axis)
         camera_yaw = fixed_camera.image_pair.ref.rotation
-        camera_yaw = Rotation.from_euler('xyz', [0, 0, camera_yaw], degrees=False)
-        r_guess *= camera_yaw
-
-        r_estimate = Rotation.from_matrix(fixed_camera.pose.r)
+        cos_yaw, sin_yaw = np.cos(camera_yaw), np.sin(camera_yaw)
+        r_yaw = np.array([[cos_yaw, -sin_yaw, 0], [sin_yaw, cos_yaw, 0], [0, 0, 1]])
+        r_guess = r_guess_ @ r_yaw
 
-        magnitude = Rotation.magnitude(r_estimate * r_guess.inv())
+        # Angle of rotation between estimate and guess from trace of relative rotation matrix
+        r_diff = fixed_camera.pose.r @ r_guess.T
+        magnitude = np.arccos(np.clip((np.trace(r_diff) - 1) / 2, -1., 1.))
 
-        threshold = self.get_parameter('attitude_deviation_threshold').get_parameter_value().integer_value
+        threshold = self._p_attitude_deviation_threshold
         threshold = np.radians(threshold)
 
         if magnitude > threshold:
@@ -453,44 +706,27 @@ class PoseEstimationNode(CameraSubscriberNode):
         :param max_pitch: The limit for the pitch in degrees from nadir over which it will be considered too high
         :return: True if pitch is too high
         """
-        assert_type(max_pitch, get_args(Union[int, float]))
+        if __debug__:
+            assert_type(max_pitch, get_args(Union[int, float]))
         pitch = None
-        if self._gimbal_quaternion is not None:
-            gimbal_attitude = Attitude(q=messaging.as_np_quaternion(self._gimbal_quaternion), extrinsic=True)
+        gimbal_attitude = self._gimbal_attitude
+        if gimbal_attitude is not None:
             # TODO: do not assume zero roll here - camera attitude handling needs refactoring
             # +90 degrees to re-center from FRD frame to nadir-facing camera as origin for max pitch comparison
             pitch = np.degrees(gimbal_attitude.pitch) + 90
         else:
-            self.get_logger().warn('Gimbal attitude was not available, assuming camera pitch too high.')
+            self.get_logger().warn('Gimbal attitude was not available, assuming camera pitch too high.',
+                                   throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return True
 
         assert pitch is not None
         if pitch > max_pitch:
-            self.get_logger().warn(f'Camera pitch {pitch} is above limit {max_pitch}.')
+            self.get_logger().warn(f'Camera pitch {pitch} is above limit {max_pitch}.',
+                                   throttle_duration_sec=self._SKIP_FRAME_LOG_THROTTLE)
             return True
 
         return False
 
-    def _export_position(self, position: GeoPt, fov: GeoTrapezoid, filename: str) -> None:
-        """Exports the computed position and field of view into a GeoJSON file
-
-        .. note::
-            The GeoJSON file is not used by the node but can be accessed by GIS software to visualize the data it
-            contains
-
-        :param position: Computed camera position or projected principal point for gimbal projection
-        :param: fov: Field of view of camera projected to ground
-        :param filename: Name of file to write into
-        """
-        assert_type(position, GeoPt)
-        assert_type(fov, GeoTrapezoid)
-        assert_type(filename, str)
-        try:
-            position._geoseries.append(fov._geoseries).to_file(filename)
-        except Exception as e:
-            self.get_logger().error(f'Could not write file {filename} because of exception:'
-                                    f'\n{e}\n{traceback.print_exc()}')
-
     def publish(self, position: Position) -> None:
         """Publishes estimated position over ROS topic
 
@@ -512,3 +748,13 @@ class PoseEstimationNode(CameraSubscriberNode):
             )
         )
         self._geopose_pub.publish(geopose_msg)
+
+    def destroy_node(self) -> None:
+        """Shuts down pose estimation and visualization worker threads when node is destroyed"""
+        # Cancel pending work manually instead of using shutdown(cancel_futures=True) which requires Python 3.9+
+        for future in (self._pose_estimation_future, self._visualization_future):
+            if future is not None:
+                future.cancel()
+        self._pose_estimation_executor.shutdown(wait=False)
+        self._visualization_executor.shutdown(wait=False)
+        super().destroy_node()
@@ -172,12 +172,14 @@ class PX4Node(AutopilotNode):
 
         # Gimbal roll & pitch/tilt is assumed stabilized so only need yaw/pan
         yaw_mask = np.array([1, 0, 0, 1])  # TODO: remove assumption
-        assert_shape(self._vehicle_attitude.q.squeeze(), (4,))
+        if __debug__:
+            assert_shape(self._vehicle_attitude.q.squeeze(), (4,))
         vehicle_yaw = self._vehicle_attitude.q * yaw_mask
         # geometry_msgs Quaternion expects (x, y, z, w) while px4_msgs VehicleAttitude has (w, x, y, z)
         vehicle_yaw = Rotation.from_quat(np.append(vehicle_yaw[1:], vehicle_yaw[0]))
 
-        assert_shape(self._gimbal_device_set_attitude.q.squeeze(), (4,))
+        if __debug__:
+            assert_shape(self._gimbal_device_set_attitude.q.squeeze(), (4,))
         gimbal_quaternion_frd = self._gimbal_device_set_attitude.q
         gimbal_quaternion_frd = Rotation.from_quat(np.append(gimbal_quaternion_frd[1:], gimbal_quaternion_frd[0]))
         gimbal_quaternion_ned = vehicle_yaw * gimbal_quaternion_frd  # TODO: ENU instead of NED? ROS convention?
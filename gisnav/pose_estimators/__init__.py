@@ -7,8 +7,34 @@ package namespace for convenience. For example:
 
     #from gisnav.pose_estimators.loftr_pose_estimator import LoFTRPoseEstimator
     from gisnav.pose_estimators import LoFTRPoseEstimator
+
+The deep learning based pose estimators are imported lazily on first access so that importing the package (e.g. for
+:class:`.PoseEstimator`) does not import torch and the model definitions of every pose estimator.
 """
+import importlib
+
 from .pose_estimator import PoseEstimator
 from .keypoint_pose_estimator import KeypointPoseEstimator
-from .superglue_pose_estimator import SuperGluePoseEstimator
-from .loftr_pose_estimator import LoFTRPoseEstimator
+
+_LAZY_IMPORTS = {
+    'SuperGluePoseEstimator': '.superglue_pose_estimator',
+    'LoFTRPoseEstimator': '.loftr_pose_estimator',
+}
+"""Lazily imported class names and the modules they are defined in"""
+
+__all__ = ['PoseEstimator', 'KeypointPoseEstimator', *_LAZY_IMPORTS]
+
+
+def __getattr__(name: str):
+    """Imports pose estimators listed in :py:attr:`._LAZY_IMPORTS` on first access (PEP 562)"""
+    module_name = _LAZY_IMPORTS.get(name, None)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Skip __getattr__ on subsequent accesses
+    return value
+
+
+def __dir__():
+    """Includes lazily imported names in addition to module globals"""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -34,8 +34,8 @@ class KeypointPoseEstimator(PoseEstimator):
         Note that this method is called by :meth:`.estimate_pose` and should not be used outside the implementing
         class.
 
-        :param query: The first (query) image for pose estimation
-        :param reference: The second (reference) image for pose estimation
+        :param query: The first (query) image for pose estimation (BGR or grayscale)
+        :param reference: The second (reference) image for pose estimation (BGR or grayscale)
         :return: Tuple of matched keypoint arrays for the images, or None if none could be found
         """
         pass
@@ -48,8 +48,8 @@ class KeypointPoseEstimator(PoseEstimator):
 
         Uses :class:`._find_matching_keypoints` to estimate matching keypoints before estimating pose.
 
-        :param query: The first (query) image for pose estimation
-        :param reference: The second (reference) image for pose estimation
+        :param query: The first (query) image for pose estimation (BGR or grayscale)
+        :param reference: The second (reference) image for pose estimation (BGR or grayscale)
         :param k: Camera intrinsics matrix (3, 3)
         :param guess: Optional initial guess for camera pose
         :param elevation_reference: Optional elevation raster (same size resolution as reference image, grayscale)
@@ -81,6 +81,7 @@ class KeypointPoseEstimator(PoseEstimator):
         r, _ = cv2.Rodrigues(r)
         pose = r, t
 
-        assert_pose(pose)
+        if __debug__:
+            assert_pose(pose)
 
         return r, t
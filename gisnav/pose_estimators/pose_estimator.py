@@ -16,8 +16,8 @@ class PoseEstimator(ABC):
                  elevation_reference: Optional[np.ndarray] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
         """Returns pose between provided images, or None if pose cannot be estimated
 
-        :param query: The first (query) image for pose estimation
-        :param reference: The second (reference) image for pose estimation
+        :param query: The first (query) image for pose estimation (BGR or grayscale)
+        :param reference: The second (reference) image for pose estimation (BGR or grayscale)
         :param k: Camera intrinsics matrix of shape (3, 3)
         :param guess: Optional initial guess for camera pose
         :param elevation_reference: Optional elevation raster (same size resolution as reference image, grayscale)
@@ -1,4 +1,5 @@
 """Module that contains an adapter for the SuperGluePoseEstimator GNN model."""
+import warnings
 import torch
 import cv2
 import numpy as np
@@ -23,17 +24,63 @@ class SuperGluePoseEstimator(KeypointPoseEstimator):
         CPU = 'cpu'
         CUDA = 'cuda'
 
-    def __init__(self, min_matches: int, params: dict) -> None:
+    def __init__(self, min_matches: int, params: dict, compile_model: bool = False,
+                 cudnn_benchmark: bool = False) -> None:
         """Class initializer
 
         :param min_matches: Minimum required keypoint matches (should be >= 4)
         :param params: SuperGluePoseEstimator params to be passed to
             :class:`SuperGluePretrainedNetwork.models.matching.Matching`
+        :param compile_model: Set True to compile the SuperGlue graph neural network with :func:`torch.compile`
+            (requires PyTorch 2.0 or newer, first frames will be slow while the model is being compiled)
+        :param cudnn_benchmark: Set True to enable cuDNN convolution algorithm autotuning on CUDA. Input resolution
+            stays the same between frames so the fastest algorithms are picked on the first frame. Note that this sets
+            the process-wide :py:attr:`torch.backends.cudnn.benchmark` flag which affects all other torch users in the
+            same process.
         """
         super(SuperGluePoseEstimator, self).__init__(min_matches)
         self._device = SuperGluePoseEstimator.TorchDevice.CUDA.value if torch.cuda.is_available() else \
             SuperGluePoseEstimator.TorchDevice.CPU.value
         self._matching = Matching(params).eval().to(self._device)
+        if self._device == SuperGluePoseEstimator.TorchDevice.CUDA.value:
+            if cudnn_benchmark:
+                torch.backends.cudnn.benchmark = True
+            # Use the channels last layout preferred by tensor core convolutions
+            self._matching = self._matching.to(memory_format=torch.channels_last)
+
+        if compile_model:
+            if hasattr(torch, 'compile'):
+                # Fuse the many small attention and MLP kernels of the GNN. Number of keypoints varies between frames
+                # so shapes are dynamic (no CUDA graphs). SuperPoint is left as is because its keypoint extraction is
+                # data dependent and would cause graph breaks.
+                self._matching.superglue = torch.compile(self._matching.superglue, dynamic=True)
+            else:
+                warnings.warn('torch.compile is not available (PyTorch 2.0 or newer required), model not compiled.')
+        self._pinned_buffers = {}  # Page-locked host buffers for staging images, keyed by input name
+        # BGR to grayscale conversion weights (same as cv2.COLOR_BGR2GRAY), pre-scaled to normalize to [0, 1]
+        self._bgr_to_gray = torch.tensor([0.114, 0.587, 0.299], device=self._device) / 255.
+
+    def _to_tensor(self, name: str, img: np.ndarray) -> torch.Tensor:
+        """Converts image to normalized grayscale tensor of shape (1, 1, h, w) on :py:attr:`._device`
+
+        On CUDA the image is staged through a persistent page-locked host buffer and uploaded asynchronously. BGR
+        images are converted to grayscale on the GPU, grayscale images are uploaded as is.
+
+        :param name: Name of the input (one buffer is kept per input)
+        :param img: BGR or grayscale image
+        :return: Grayscale image tensor on :py:attr:`._device`
+        """
+        if self._device == SuperGluePoseEstimator.TorchDevice.CUDA.value:
+            buffer = self._pinned_buffers.get(name, None)
+            if buffer is None or tuple(buffer.shape) != img.shape:
+                buffer = torch.empty(img.shape, dtype=torch.uint8, pin_memory=True)
+                self._pinned_buffers[name] = buffer
+            np.copyto(buffer.numpy(), img)
+            tensor = buffer.to(self._device, non_blocking=True).float()
+            tensor = tensor @ self._bgr_to_gray if img.ndim == 3 else tensor / 255.
+            return tensor[None][None].contiguous(memory_format=torch.channels_last)
+        else:
+            return frame2tensor(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img, self._device)
 
     def _find_matching_keypoints(self, query: np.ndarray, reference: np.ndarray) \
             -> Optional[Tuple[np.ndarray, np.ndarray]]:
@@ -43,21 +90,29 @@ class SuperGluePoseEstimator(KeypointPoseEstimator):
         :param reference: The second (reference) image for pose estimation
         :return: Tuple of matched keypoint arrays for the images, or None if none could be found
         """
-        qry_grayscale = cv2.cvtColor(query, cv2.COLOR_BGR2GRAY)
-        ref_grayscale = cv2.cvtColor(reference, cv2.COLOR_BGR2GRAY)
-        qry_tensor = frame2tensor(qry_grayscale, self._device)
-        ref_tensor = frame2tensor(ref_grayscale, self._device)
-
-        pred = self._matching({'image0': qry_tensor, 'image1': ref_tensor})
-        pred = {k: v[0].cpu().detach().numpy() for k, v in pred.items()}
-        kp_qry, kp_ref = pred['keypoints0'], pred['keypoints1']
-        matches, conf = pred['matches0'], pred['matching_scores0']
-
-        valid = np.logical_and(matches > -1, conf >= conf_threshold)
-        if len(valid) == 0:
-            return None
-        else:
-            # Valid matched keypoints ('mkp') that pass confidence threshold
-            mkp_qry = kp_qry[valid]
-            mkp_ref = kp_ref[matches[valid]]
-            return mkp_qry, mkp_ref
+        qry_tensor = self._to_tensor('query', query)
+        ref_tensor = self._to_tensor('reference', reference)
+
+        # Mixed precision roughly halves memory traffic and enables tensor cores on CUDA
+        use_amp = self._device == SuperGluePoseEstimator.TorchDevice.CUDA.value
+        with torch.inference_mode(), torch.autocast(self._device, dtype=torch.float16, enabled=use_amp):
+            data = {'image0': qry_tensor, 'image1': ref_tensor}
+            if qry_tensor.shape == ref_tensor.shape:
+                # Detect keypoints for both images in a single batched SuperPoint forward pass, Matching skips
+                # keypoint detection for images that already have keypoints
+                features = self._matching.superpoint({'image': torch.cat((qry_tensor, ref_tensor))})
+                for i in range(2):
+                    data.update({f'{k}{i}': [v[i]] for k, v in features.items()})
+            pred = {**data, **self._matching(data)}
+
+            # Filter matches on the device and only transfer the matched keypoints to host memory (descriptors and
+            # unmatched keypoints are not needed)
+            matches, conf = pred['matches0'][0], pred['matching_scores0'][0]
+            valid = torch.logical_and(matches > -1, conf >= self.DEFAULT_CONFIDENCE_THRESHOLD)
+            if len(valid) == 0:
+                return None
+            else:
+                # Valid matched keypoints ('mkp') that pass confidence threshold
+                mkp_qry = pred['keypoints0'][0][valid].float().cpu().numpy()
+                mkp_ref = pred['keypoints1'][0][matches[valid]].float().cpu().numpy()
+                return mkp_qry, mkp_ref